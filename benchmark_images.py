@@ -0,0 +1,57 @@
+from scraperly.frames import letterbox
+from scraperly.workers import ImageProcessPool
+from PIL import Image
+import numpy as np
+import argparse
+import os
+import tempfile
+import time
+
+def make_images(directory, count, width=1344, height=768):
+    """Write synthetic webp images the size Lexica usually serves"""
+    paths = []
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        path = os.path.join(directory, f"image_{i}.webp")
+        pixels = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(path, quality=80)
+        paths.append(path)
+    return paths
+
+def single_core(paths):
+    for path in paths:
+        with Image.open(path) as img:
+            letterbox(img)
+
+def multi_core(pool, paths):
+    for _ in pool.letterbox_files(enumerate(paths), lambda key, frame: None):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare single-core and multi-core image letterboxing")
+    parser.add_argument("--images", type=int, default=48)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Generating {args.images} images...")
+        paths = make_images(directory, args.images)
+
+        start = time.perf_counter()
+        single_core(paths)
+        single = time.perf_counter() - start
+        print(f"1 core:  {single:.2f}s ({args.images / single:.1f} img/s)")
+
+        pool = ImageProcessPool(workers=args.workers)
+        try:
+            # Warm the pool up so process start-up is not counted
+            multi_core(pool, paths[:args.workers])
+            start = time.perf_counter()
+            multi_core(pool, paths)
+            multi = time.perf_counter() - start
+        finally:
+            pool.close()
+        print(f"{args.workers} cores: {multi:.2f}s ({args.images / multi:.1f} img/s, {single / multi:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
-from .lexica import LexicaScraper
+from .lexica import LexicaScraper, LexicaScraperPool, LexicaHTTPClient, CachedLexicaScraper
 from .providers import get_ai_provider
 from .processor import ContentProcessor
+from .profiles import RenderProfile, RENDER_PROFILES
+from .tts import TTSBackend, AudioCache, get_tts_backend
+from .manifest import RenderManifest
 
 __version__ = "2.0.0"
 
@@ -11,7 +14,10 @@ def scraperly(
     max_images_per_segment: int = 2,
     model: str = None,
     output_video_path: str = "output_with_captions.mp4",
-    output_json_path: str = "processed_content.json"
+    output_json_path: str = "processed_content.json",
+    render_profile="default",
+    tts_backend="gtts",
+    tts_options: dict = None
 ) -> ContentProcessor:
     """
     Initialize and process content with the specified AI provider configuration.
@@ -24,6 +30,12 @@ def scraperly(
         model (str, optional): Specific model to use with the provider. If not specified, uses provider's default.
         output_video_path (str, optional): Path for the output video file. Defaults to "output_with_captions.mp4"
         output_json_path (str, optional): Path for the processed content JSON file. Defaults to "processed_content.json"
+        render_profile (str or RenderProfile, optional): Output size and encoder settings, either a RenderProfile
+            or one of the preset names "default", "draft", "vertical-short" and "archive". Defaults to "default".
+        tts_backend (str or TTSBackend, optional): Speech engine for the narration, "gtts" (online), "espeak" or
+            "piper" (offline), or a TTSBackend instance. Defaults to "gtts".
+        tts_options (dict, optional): Settings for a backend given by name, e.g. {"lang": "fr"} for gtts or
+            {"model": "voice.onnx"} for piper.
     
     Returns:
         ContentProcessor: Configured processor ready to handle the content
@@ -38,7 +50,10 @@ def scraperly(
             provider_name=provider_name,
             api_key=api_key,
             model=model,
-            max_images_per_segment=max_images_per_segment
+            max_images_per_segment=max_images_per_segment,
+            render_profile=render_profile,
+            tts_backend=tts_backend,
+            tts_options=tts_options
         )
 
         if content:
@@ -65,4 +80,4 @@ def scraperly(
         if 'processor' in locals() and hasattr(processor, 'scraper'):
             processor.scraper.close()
 
-__all__ = ['LexicaScraper', 'get_ai_provider', 'ContentProcessor', 'scraperly'] 
\ No newline at end of file
+__all__ = ['LexicaScraper', 'LexicaScraperPool', 'LexicaHTTPClient', 'CachedLexicaScraper', 'get_ai_provider', 'ContentProcessor', 'RenderProfile', 'RENDER_PROFILES', 'TTSBackend', 'AudioCache', 'get_tts_backend', 'RenderManifest', 'scraperly'] 
\ No newline at end of file
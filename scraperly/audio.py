@@ -0,0 +1,243 @@
+"""
+Audio file metadata read from headers, without decoding
+"""
+
+import os
+import re
+import shutil
+import struct
+import subprocess
+import wave
+
+# Bitrates in kbit/s by [MPEG-1][layer] and [MPEG-2/2.5][layer]
+_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# How much of the file is read to find the first frame and its VBR tag
+_HEADER_BYTES = 64 * 1024
+
+_SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    2.5: [11025, 12000, 8000],
+}
+
+
+class _FrameHeader:
+    """Decoded fields of a 4-byte MPEG audio frame header"""
+
+    __slots__ = ("version", "layer", "sample_rate", "length", "samples", "mono")
+
+    def __init__(self, version, layer, sample_rate, length, samples, mono):
+        self.version = version
+        self.layer = layer
+        self.sample_rate = sample_rate
+        self.length = length
+        self.samples = samples
+        self.mono = mono
+
+
+def _parse_header(data, pos):
+    """Return the frame header at `pos`, or None if it isn't a valid one"""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = {0: 2.5, 2: 2, 3: 1}.get((b1 >> 3) & 0x3)
+    layer = {1: 3, 2: 2, 3: 1}.get((b1 >> 1) & 0x3)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x3
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x1
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if layer == 2 or version == 1 else 576
+        length = samples // 8 * bitrate // sample_rate + padding
+    mono = (b3 >> 6) == 3
+    return _FrameHeader(version, layer, sample_rate, length, samples, mono)
+
+
+def _id3v2_size(data):
+    """Length of a leading ID3v2 tag, 0 if there is none"""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _find_first_frame(data, pos):
+    """Find a frame header at or after `pos` that is followed by another one"""
+    while True:
+        pos = data.find(b"\xff", pos)
+        if pos < 0:
+            return None, None
+        header = _parse_header(data, pos)
+        if header is not None:
+            following = pos + header.length
+            # A lone match may just be 0xFF inside other data
+            if following >= len(data) or _parse_header(data, following) is not None:
+                return pos, header
+        pos += 1
+
+
+def _xing_offset(pos, header):
+    """Where a Xing/Info tag would start in the frame at `pos`, after the side info"""
+    if header.version == 1:
+        side_info = 17 if header.mono else 32
+    else:
+        side_info = 9 if header.mono else 17
+    return pos + 4 + side_info
+
+
+def _vbr_tag_samples(data, pos, header, stream_size):
+    """
+    Total samples announced by a Xing/Info or VBRI tag in the first frame,
+    minus the LAME encoder delay and padding. None if there is no tag.
+    `stream_size` is the length of the audio from the start of `data`.
+    """
+    xing = _xing_offset(pos, header)
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if not flags & 0x1:
+            return None
+        frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+        offset = xing + 12
+        stream_bytes = None
+        if flags & 0x2:
+            stream_bytes = struct.unpack(">I", data[offset:offset + 4])[0]
+            offset += 4
+        if flags & 0x4:
+            offset += 100
+        if flags & 0x8:
+            offset += 4
+        if stream_bytes and pos + stream_bytes < stream_size - 1024:
+            # More audio follows than the tag describes, e.g. joined files
+            return None
+        samples = frames * header.samples
+        lame = data[offset:offset + 24]
+        if len(lame) == 24 and lame[:4] in (b"LAME", b"Lavf", b"Lavc"):
+            delay = (lame[21] << 4) | (lame[22] >> 4)
+            padding = ((lame[22] & 0x0F) << 8) | lame[23]
+            samples = max(0, samples - delay - padding)
+        return samples
+
+    vbri = pos + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI":
+        frames = struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+        return frames * header.samples
+    return None
+
+
+def mp3_duration(path: str) -> float:
+    """
+    Duration of an MP3 file in seconds, read from its VBR tag or by walking
+    the frame headers. Only the start of the file is read when it has a VBR
+    tag. Raises ValueError if no MPEG audio frames are found.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        data = f.read(_HEADER_BYTES)
+        start = _id3v2_size(data)
+        if start >= len(data):
+            # The ID3 tag may hold cover art bigger than the first read
+            f.seek(start)
+            data = f.read(_HEADER_BYTES)
+        elif start:
+            data = data[start:]
+
+        pos, header = _find_first_frame(data, 0)
+        if header is not None:
+            tagged = _vbr_tag_samples(data, pos, header, file_size - start)
+            if tagged is not None:
+                return tagged / header.sample_rate
+
+        # No tag, the frames have to be counted
+        data += f.read()
+
+    pos, header = _find_first_frame(data, 0)
+    if header is None:
+        raise ValueError(f"No MPEG audio frames found in {path}")
+
+    samples = 0
+    sample_rate = header.sample_rate
+    end = len(data)
+    while pos < end:
+        header = _parse_header(data, pos)
+        if header is None:
+            if data[pos:pos + 3] == b"TAG" or data[pos:pos + 8] == b"APETAGEX":
+                break
+            # Skip junk between frames
+            pos, header = _find_first_frame(data, pos + 1)
+            if header is None:
+                break
+            continue
+        if pos + header.length > end:
+            break
+        xing = _xing_offset(pos, header)
+        # Tag frames of joined files carry no audio
+        if data[xing:xing + 4] not in (b"Xing", b"Info"):
+            samples += header.samples
+        pos += header.length
+    return samples / sample_rate
+
+
+def wav_duration(path: str) -> float:
+    """Duration of a WAV file in seconds"""
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+def _probe_duration(path: str) -> float:
+    """Ask ffprobe (or ffmpeg) for the container's duration"""
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe:
+        result = subprocess.run(
+            [ffprobe, "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            return float(result.stdout.decode().strip())
+        except ValueError:
+            pass
+
+    from .render import ffmpeg_executable
+    result = subprocess.run(
+        [ffmpeg_executable(), "-hide_banner", "-i", path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    match = re.search(rb"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+    if not match:
+        raise ValueError(f"Could not read the duration of {path}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def audio_duration(path: str) -> float:
+    """
+    Duration of an audio file in seconds.
+
+    MP3 and WAV files are measured from their headers; anything else, or
+    a file the header readers can't make sense of, falls back to ffprobe.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".mp3":
+            return mp3_duration(path)
+        if extension == ".wav":
+            return wav_duration(path)
+    except (ValueError, EOFError, wave.Error, struct.error):
+        pass
+    return _probe_duration(path)
@@ -0,0 +1,279 @@
+"""
+Persistent caches shared by scraperly components
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def default_cache_dir():
+    """Return the directory used for scraperly's on-disk caches"""
+    cache_dir = os.environ.get("SCRAPERLY_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "scraperly")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def hash_key(*parts):
+    """Build a stable cache key from JSON-serializable parts"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ThreadLocalConnection:
+    """SQLite connection per thread and process, opened in WAL mode"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+
+class MemoryCache:
+    """In-process cache with the same interface as SQLiteCache"""
+
+    def __init__(self, ttl=None, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or (entry[1] is not None and entry[1] <= now):
+                self.misses += 1
+                return default
+            # Re-insert to mark as most recently used
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires_at)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+
+class SQLiteCache:
+    """
+    On-disk key/value cache backed by SQLite.
+
+    Entries expire after `ttl` seconds and the least recently used entries are
+    evicted once the cache grows past `max_entries` or `max_bytes`. The
+    database runs in WAL mode so several processes can share one file.
+    """
+
+    def __init__(self, path=None, namespace="default", ttl=None, max_entries=10000, max_bytes=None):
+        self.path = path or os.path.join(default_cache_dir(), "cache.sqlite3")
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._connections = ThreadLocalConnection(self.path)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_lru ON entries (namespace, accessed_at)"
+        )
+
+    def _connection(self):
+        """Return a connection owned by the current thread and process"""
+        return self._connections.get()
+
+    def _count(self, attr):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def get(self, key, default=None):
+        """Return the cached value for `key`, or `default` if missing or expired"""
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            now = time.time()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self._count("misses")
+                return default
+
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key)
+            )
+            self._count("hits")
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            print(f"Cache read failed: {e}")
+            self._count("misses")
+            return default
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value under `key`"""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        try:
+            conn = self._connection()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (namespace, key, value, size, created_at, accessed_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (self.namespace, key, payload, len(payload), now, now, now + ttl if ttl else None)
+            )
+            self._evict(conn, now)
+        except sqlite3.Error as e:
+            print(f"Cache write failed: {e}")
+
+    def _evict(self, conn, now):
+        """Drop expired entries, then least recently used ones over the limits"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+                (self.namespace, now)
+            ).rowcount
+
+            count, total_size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?",
+                (self.namespace,)
+            ).fetchone()
+
+            if self.max_entries and count > self.max_entries:
+                removed += conn.execute(
+                    """
+                    DELETE FROM entries WHERE namespace = ? AND key IN (
+                        SELECT key FROM entries WHERE namespace = ?
+                        ORDER BY accessed_at ASC LIMIT ?
+                    )
+                    """,
+                    (self.namespace, self.namespace, count - self.max_entries)
+                ).rowcount
+
+            if self.max_bytes and total_size > self.max_bytes:
+                rows = conn.execute(
+                    "SELECT key, size FROM entries WHERE namespace = ? ORDER BY accessed_at ASC",
+                    (self.namespace,)
+                )
+                stale_keys = []
+                for key, size in rows:
+                    if total_size <= self.max_bytes:
+                        break
+                    stale_keys.append((self.namespace, key))
+                    total_size -= size
+                conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", stale_keys)
+                removed += len(stale_keys)
+
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if removed:
+            with self._lock:
+                self.evictions += removed
+
+    def delete(self, key):
+        self._connection().execute(
+            "DELETE FROM entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        )
+
+    def clear(self):
+        self._connection().execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+
+    def stats(self):
+        """Return hit/miss counters for this instance and the namespace's size on disk"""
+        count, total_size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?",
+            (self.namespace,)
+        ).fetchone()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": count,
+                "bytes": total_size,
+            }
+
+
+_default_response_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide cache shared by all AI providers"""
+    global _default_response_cache
+    with _default_cache_lock:
+        if _default_response_cache is None:
+            _default_response_cache = SQLiteCache(
+                namespace="llm",
+                ttl=30 * 24 * 3600,
+                max_entries=10000
+            )
+        return _default_response_cache
@@ -0,0 +1,115 @@
+"""
+Frame composition helpers for turning images into video frames
+"""
+
+import threading
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+_buffers = threading.local()
+
+RESAMPLE_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "bilinear": Image.Resampling.BILINEAR,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+
+
+@lru_cache(maxsize=None)
+def black_frame(width: int = 1920, height: int = 1080) -> np.ndarray:
+    """Return a shared, read-only black frame of the given size"""
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame.flags.writeable = False
+    return frame
+
+
+def frame_buffer(width: int = 1920, height: int = 1080) -> np.ndarray:
+    """
+    Return a scratch frame owned by the calling thread.
+
+    The same buffer is handed out on every call with the same size, so its
+    contents must be copied or persisted before the thread composes the next
+    frame.
+    """
+    cache = getattr(_buffers, "frames", None)
+    if cache is None:
+        cache = _buffers.frames = {}
+    buffer = cache.get((width, height))
+    if buffer is None:
+        buffer = cache[(width, height)] = np.empty((height, width, 3), dtype=np.uint8)
+    return buffer
+
+
+def fit_size(size: Tuple[int, int], target_width: int, target_height: int) -> Tuple[int, int]:
+    """Largest size with the image's aspect ratio that fits inside the target"""
+    target_ratio = target_width / target_height
+    image_ratio = size[0] / size[1]
+    if image_ratio > target_ratio:
+        # Image is wider than the frame
+        return target_width, max(1, int(target_width / image_ratio))
+    # Image is taller than the frame
+    return max(1, int(target_height * image_ratio)), target_height
+
+
+def _has_alpha(img: Image.Image) -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+
+
+def flatten_alpha(pixels: np.ndarray, background: Tuple[int, int, int] = (0, 0, 0)) -> np.ndarray:
+    """Composite RGBA pixels over a solid background color, returning RGB"""
+    alpha = pixels[..., 3:4].astype(np.uint16)
+    rgb = pixels[..., :3].astype(np.uint16)
+    bg = np.asarray(background, dtype=np.uint16)
+    # Rounded integer blend: (rgb * a + bg * (255 - a)) / 255
+    blended = rgb * alpha + bg * (255 - alpha) + 127
+    return (blended // 255).astype(np.uint8)
+
+
+def letterbox(
+    img: Image.Image,
+    target_width: int = 1920,
+    target_height: int = 1080,
+    out: Optional[np.ndarray] = None,
+    background: Tuple[int, int, int] = (0, 0, 0),
+    resample: str = "lanczos"
+) -> np.ndarray:
+    """
+    Resize an image to fit the video frame, padding it with bars.
+
+    The result is written into `out` when given (for example a buffer from
+    `frame_buffer()` or a shared memory view), otherwise into a new array.
+    Only the bars are filled, the image area is written once. Transparent
+    pixels are blended over `background`. `resample` names the filter used
+    for scaling, see RESAMPLE_FILTERS.
+    """
+    if out is None:
+        out = np.empty((target_height, target_width, 3), dtype=np.uint8)
+
+    new_width, new_height = fit_size(img.size, target_width, target_height)
+    if img.format == "JPEG":
+        # Small targets: let the decoder skip detail we'd throw away anyway
+        img.draft('RGB', (new_width, new_height))
+
+    if _has_alpha(img):
+        img = img.convert('RGBA')
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    img = img.resize((new_width, new_height), RESAMPLE_FILTERS[resample])
+    pixels = np.asarray(img)
+    if pixels.shape[2] == 4:
+        pixels = flatten_alpha(pixels, background)
+
+    # Center the image and fill the bars around it
+    x = (target_width - new_width) // 2
+    y = (target_height - new_height) // 2
+    out[:y] = background
+    out[y + new_height:] = background
+    out[y:y + new_height, :x] = background
+    out[y:y + new_height, x + new_width:] = background
+    out[y:y + new_height, x:x + new_width] = pixels
+    return out
@@ -0,0 +1,334 @@
+"""
+Content-addressed on-disk cache for downloaded images
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+from .cache import ThreadLocalConnection, default_cache_dir
+from .transport import get_transport
+
+
+class ImageCache:
+    """
+    Cache raw image bytes on disk, keyed by URL and stored by content hash.
+
+    Entries younger than `max_age` seconds are served without touching the
+    network. Older ones are revalidated with If-None-Match/If-Modified-Since,
+    so unchanged images cost a 304 instead of a full download. Once the
+    stored images exceed `max_bytes`, the least recently used are evicted.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=2 * 1024 ** 3, max_age=24 * 3600, transport=None):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "images")
+        self.blob_dir = os.path.join(self.cache_dir, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.transport = transport if transport is not None else get_transport()
+        self._connections = ThreadLocalConnection(os.path.join(self.cache_dir, "index.sqlite3"))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        self._connections.get().execute(
+            """
+            CREATE TABLE IF NOT EXISTS images (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+
+    def blob_path(self, digest):
+        """Path of the stored bytes for a content hash"""
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _count(self, attr):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def _lookup(self, url):
+        row = self._connections.get().execute(
+            "SELECT digest, etag, last_modified, fetched_at FROM images WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if row is None or not os.path.exists(self.blob_path(row[0])):
+            return None
+        return {"digest": row[0], "etag": row[1], "last_modified": row[2], "fetched_at": row[3]}
+
+    def _read(self, digest):
+        with open(self.blob_path(digest), "rb") as f:
+            return f.read()
+
+    def _touch(self, url, revalidated=False):
+        now = time.time()
+        if revalidated:
+            self._connections.get().execute(
+                "UPDATE images SET accessed_at = ?, fetched_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+        else:
+            self._connections.get().execute(
+                "UPDATE images SET accessed_at = ? WHERE url = ?",
+                (now, url)
+            )
+
+    def _store(self, url, data, etag, last_modified):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial image
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+
+        now = time.time()
+        self._connections.get().execute(
+            """
+            INSERT OR REPLACE INTO images
+                (url, digest, size, etag, last_modified, fetched_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (url, digest, len(data), etag, last_modified, now, now)
+        )
+        self._evict()
+        return digest
+
+    def _evict(self):
+        """Remove least recently used images until the cache fits in max_bytes"""
+        if not self.max_bytes:
+            return
+        conn = self._connections.get()
+        total_size = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM images)"
+        ).fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+
+        for url, digest, size in conn.execute(
+            "SELECT url, digest, size FROM images ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total_size <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM images WHERE url = ?", (url,))
+            # Blobs are shared by every URL with the same content
+            still_used = conn.execute(
+                "SELECT 1 FROM images WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if not still_used:
+                try:
+                    os.remove(self.blob_path(digest))
+                except OSError:
+                    pass
+                total_size -= size
+
+    def fetch(self, url):
+        """Return the image bytes for `url`, downloading or revalidating as needed"""
+        try:
+            return self._read(self.fetch_digest(url))
+        except FileNotFoundError:
+            # Evicted by another process between lookup and read
+            return self._read(self.fetch_digest(url))
+
+    def fetch_digest(self, url):
+        """Make sure `url` is cached and return the content hash of its bytes"""
+        entry = self._lookup(url)
+        if entry is not None and time.time() - entry["fetched_at"] < self.max_age:
+            self._touch(url)
+            self._count("hits")
+            return entry["digest"]
+
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.transport.get(url, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                self._touch(url, revalidated=True)
+                self._count("revalidated")
+                return entry["digest"]
+            response.raise_for_status()
+        except Exception as e:
+            if entry is not None:
+                print(f"Revalidating {url} failed, using cached copy: {e}")
+                self._touch(url)
+                return entry["digest"]
+            raise
+
+        self._count("misses")
+        return self._store(
+            url,
+            response.content,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified")
+        )
+
+    def stats(self):
+        """Return cache counters and the number of bytes stored"""
+        entries, total_size = self._connections.get().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM images"
+        ).fetchone()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "entries": entries,
+                "bytes": total_size,
+            }
+
+
+class FrameCache:
+    """
+    Cache of ready-to-use video frames derived from cached images.
+
+    Frames are keyed by the source image hash, target resolution, resampling
+    filter and pad color, and stored as `.npy` files that are loaded as
+    read-only memory maps, so repeated images skip decoding and resizing and
+    are never copied into process memory up front. Sizes and access times
+    are kept in a SQLite index, and least recently used frames are evicted
+    once the cache exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=4 * 1024 ** 3):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "frames")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._connections = ThreadLocalConnection(os.path.join(self.cache_dir, "index.sqlite3"))
+        self._lock = threading.Lock()
+        self._total_size = None
+        self.hits = 0
+        self.misses = 0
+
+        conn = self._connections.get()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS frames (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        if conn.execute("SELECT 1 FROM frames LIMIT 1").fetchone() is None:
+            self._index_existing()
+
+    def _index_existing(self):
+        """Add frames written before the cache had an index"""
+        rows = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(".npy"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                rows.append((name[:-len(".npy")], stat.st_size, stat.st_mtime))
+        if rows:
+            self._connections.get().executemany(
+                "INSERT OR IGNORE INTO frames (key, size, accessed_at) VALUES (?, ?, ?)", rows
+            )
+
+    @staticmethod
+    def key(digest, size, resample, pad_color):
+        width, height = size
+        color = "".join(f"{channel:02x}" for channel in pad_color)
+        return f"{digest}-{width}x{height}-{resample}-{color}"
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npy")
+
+    def get(self, key):
+        """Return the cached frame as a read-only memory map, or None"""
+        import numpy as np
+
+        try:
+            frame = np.load(self.path(key), mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        # Mark as recently used for eviction
+        self._connections.get().execute(
+            "UPDATE frames SET accessed_at = ? WHERE key = ?", (time.time(), key)
+        )
+        with self._lock:
+            self.hits += 1
+        return frame
+
+    def put(self, key, frame):
+        """Store a frame and return it memory-mapped from the cache"""
+        import numpy as np
+
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.ascontiguousarray(frame))
+        os.replace(temp_path, path)
+
+        size = os.path.getsize(path)
+        conn = self._connections.get()
+        previous = conn.execute("SELECT size FROM frames WHERE key = ?", (key,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO frames (key, size, accessed_at) VALUES (?, ?, ?)",
+            (key, size, time.time())
+        )
+        with self._lock:
+            if self._total_size is not None:
+                self._total_size += size - (previous[0] if previous else 0)
+            over_limit = self.max_bytes and (self._total_size is None or self._total_size > self.max_bytes)
+        if over_limit:
+            self._evict()
+        try:
+            return np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            # Evicted right away; the caller may reuse `frame`, so hand back a copy
+            return np.array(frame)
+
+    def _evict(self):
+        """
+        Delete least recently used frames until the cache fits in max_bytes.
+        Only runs when the running size total goes over the limit; the total
+        is re-read from the index first since other processes share it.
+        """
+        conn = self._connections.get()
+        total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM frames").fetchone()[0]
+        if total_size > self.max_bytes:
+            for key, size in conn.execute(
+                "SELECT key, size FROM frames ORDER BY accessed_at ASC"
+            ).fetchall():
+                if total_size <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM frames WHERE key = ?", (key,))
+                try:
+                    os.remove(self.path(key))
+                except OSError:
+                    pass
+                total_size -= size
+        with self._lock:
+            self._total_size = total_size
+
+    def stats(self):
+        entries, total_size = self._connections.get().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM frames"
+        ).fetchone()
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total_size}
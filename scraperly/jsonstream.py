@@ -0,0 +1,118 @@
+"""
+Incremental parsing of JSON arrays that arrive in chunks from a streaming LLM
+"""
+
+import json
+
+
+class JSONArrayStreamParser:
+    """
+    Emit the elements of a top-level JSON array as soon as each one is complete.
+
+    Any text before the opening bracket (prose, markdown code fences) is
+    skipped, so `feed` can be called directly with raw model output.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._element_start = None
+
+    @property
+    def finished(self):
+        """True once the closing bracket of the array has been seen"""
+        return self._finished
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return the elements completed by it"""
+        if self._finished or not chunk:
+            return []
+
+        self._buffer += chunk
+        elements = []
+        buffer = self._buffer
+        pos = self._pos
+
+        while pos < len(buffer):
+            char = buffer[pos]
+
+            if not self._started:
+                if char == "[":
+                    self._started = True
+                    self._depth = 1
+                pos += 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        elements.append(self._finish_element(pos + 1))
+                pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._element_start = pos
+            elif char in "[{":
+                if self._depth == 1:
+                    self._element_start = pos
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    # Flush a trailing scalar such as a number or literal
+                    if self._element_start is not None:
+                        elements.append(self._finish_element(pos))
+                    self._finished = True
+                    pos += 1
+                    break
+                if self._depth == 1:
+                    elements.append(self._finish_element(pos + 1))
+            elif char == ",":
+                if self._depth == 1 and self._element_start is not None:
+                    elements.append(self._finish_element(pos))
+            elif not char.isspace() and self._depth == 1 and self._element_start is None:
+                self._element_start = pos
+            pos += 1
+
+        # Drop consumed text, keeping any partial element
+        keep_from = self._element_start if self._element_start is not None else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._element_start is not None:
+            self._element_start -= keep_from
+
+        return [element for element in elements if element is not _SKIP]
+
+    def _finish_element(self, end):
+        raw = self._buffer[self._element_start:end].strip()
+        self._element_start = None
+        if not raw:
+            return _SKIP
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return _SKIP
+
+
+_SKIP = object()
+
+
+def iter_json_array(chunks):
+    """Yield the elements of a JSON array streamed as an iterable of text chunks"""
+    parser = JSONArrayStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.finished:
+            break
@@ -15,13 +15,157 @@ import time
 import json
 import urllib.parse
 import os
+import queue
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .transport import get_transport
+from .cache import SQLiteCache, hash_key
+
+def _find_free_port():
+    """Ask the OS for a port that's currently unused"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class LexicaHTTPClient:
+    """
+    Browser-free Lexica search.
+
+    Results come from the site's JSON search endpoint when it answers, and
+    otherwise from the server-rendered search page. Both are parsed into the
+    same dicts that LexicaScraper.extract_modal_data returns.
+    """
+
+    def __init__(
+        self,
+        base_url="https://lexica.art/",
+        api_path="api/v1/search",
+        image_host="https://image.lexica.art",
+        transport=None
+    ):
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.api_path = api_path
+        self.image_host = image_host.rstrip('/')
+        self.transport = transport if transport is not None else get_transport()
+        self.headers = {
+            "Accept": "application/json, text/html;q=0.9",
+            "User-Agent": "Mozilla/5.0 (compatible; scraperly)"
+        }
+
+    def search(self, search_query, limit=10):
+        """Return up to `limit` image dicts for the query, or [] if nothing could be parsed"""
+        try:
+            images = self._search_api(search_query)
+        except Exception as e:
+            print(f"Lexica JSON search failed: {str(e)}")
+            images = []
+        
+        if not images:
+            try:
+                images = self._search_html(search_query)
+            except Exception as e:
+                print(f"Lexica HTML search failed: {str(e)}")
+                images = []
+        
+        return images[:limit]
+
+    def _search_api(self, search_query):
+        response = self.transport.get(
+            urllib.parse.urljoin(self.base_url, self.api_path),
+            params={"q": search_query},
+            headers=self.headers
+        )
+        response.raise_for_status()
+        return [
+            image for image in (self._parse_api_image(item) for item in response.json().get("images", []))
+            if image
+        ]
+
+    def _parse_api_image(self, item):
+        image_url = self._image_url(item.get("id"), item.get("src") or item.get("srcSmall"))
+        if not image_url:
+            return None
+        return {
+            'prompt': item.get("prompt", ""),
+            'model': item.get("model", ""),
+            'image_url': image_url,
+            'dimensions': self._dimensions(item.get("width"), item.get("height"))
+        }
+
+    def _search_html(self, search_query):
+        response = self.transport.get(
+            self.base_url,
+            params={"q": search_query},
+            headers=self.headers
+        )
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, "html.parser")
+        
+        images = []
+        seen = set()
+        for img in soup.select('div[role="gridcell"] img, img[src*="lexica"]'):
+            src = img.get("src") or ""
+            if not src or src in seen:
+                continue
+            seen.add(src)
+            images.append({
+                'prompt': img.get("alt", ""),
+                'model': "",
+                'image_url': src.replace('md2_webp', 'full_webp'),
+                'dimensions': self._dimensions(img.get("data-width"), img.get("data-height"))
+            })
+        return images
+
+    def _image_url(self, image_id, fallback):
+        if image_id:
+            return f"{self.image_host}/full_webp/{image_id}"
+        return fallback.replace('md2_webp', 'full_webp') if fallback else None
+
+    @staticmethod
+    def _dimensions(width, height):
+        if width and height:
+            return f"{width} x {height}"
+        return ""
 
 class LexicaScraper:
-    def __init__(self, image_limit=10, headless=True):
+    def __init__(
+        self,
+        image_limit=10,
+        headless=True,
+        debugging_port=None,
+        backend="auto",
+        http_client=None,
+        bulk_extract=True,
+        required_fields=('prompt', 'image_url')
+    ):
+        """
+        Args:
+            image_limit: Maximum number of images returned per search
+            headless: Run Chrome without a window
+            debugging_port: Chrome remote debugging port, a free one is picked by default
+            backend: "http" to only use plain HTTP requests, "selenium" to only
+                use the browser, or "auto" to try HTTP first and fall back to
+                the browser when it returns nothing
+            http_client: LexicaHTTPClient to use for the HTTP backend (optional)
+            bulk_extract: Read all grid cells in a single script call instead of
+                opening each image's modal
+            required_fields: Fields that make bulk extraction open an image's
+                modal when the grid doesn't provide them
+        """
+        if backend not in ("auto", "http", "selenium"):
+            raise ValueError(f"Unknown Lexica backend: {backend}. Available backends: auto, http, selenium")
         self.base_url = "https://lexica.art/"
         self.image_limit = image_limit
         self.headless = headless
-        self.initialize_driver()
+        self.debugging_port = debugging_port
+        self.backend = backend
+        self.http_client = http_client or LexicaHTTPClient(base_url=self.base_url)
+        self.bulk_extract = bulk_extract
+        self.required_fields = tuple(required_fields)
+        self.driver = None
+        if backend == "selenium":
+            self.initialize_driver()
         
     def initialize_driver(self):
         """Initialize or reinitialize the Chrome driver"""
@@ -35,7 +179,9 @@ class LexicaScraper:
             options.add_argument('--disable-software-rasterizer')
             options.add_argument('--disable-extensions')
             options.add_argument('--disable-logging')
-            options.add_argument('--remote-debugging-port=9222')  # Add debugging port
+            # Unique debugging port so several browsers can run on one host
+            port = self.debugging_port or _find_free_port()
+            options.add_argument(f'--remote-debugging-port={port}')
             
             # Try to create Chrome driver directly
             try:
@@ -54,6 +200,10 @@ class LexicaScraper:
 
     def ensure_driver_active(self):
         """Ensure the driver is active, reinitialize if necessary"""
+        if self.driver is None:
+            # Browser is started lazily when the HTTP backend can't serve a search
+            self.initialize_driver()
+            return
         try:
             # Try to get the current URL to test if driver is active
             self.driver.current_url
@@ -61,6 +211,16 @@ class LexicaScraper:
             print("Reinitializing WebDriver...")
             self.initialize_driver()
 
+    def is_healthy(self):
+        """Check whether the browser session still responds"""
+        if self.driver is None:
+            return True
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
     def get_full_resolution_url(self, image_url):
         """Convert medium resolution URL to full resolution"""
         return image_url.replace('md2_webp', 'full_webp')
@@ -136,6 +296,65 @@ class LexicaScraper:
             return None
         
     def search_and_scrape(self, search_query):
+        """Search Lexica and return metadata for up to image_limit images"""
+        if self.backend in ("auto", "http"):
+            images = self.http_client.search(search_query, self.image_limit)
+            if images or self.backend == "http":
+                return images
+            print("HTTP search returned no results, falling back to browser...")
+        return self._search_with_browser(search_query)
+
+    GRID_SCRIPT = """
+        const limit = arguments[0];
+        const cells = Array.from(document.querySelectorAll('div[role="gridcell"]')).slice(0, limit);
+        return cells.map(cell => {
+            const img = cell.querySelector('img');
+            if (!img) {
+                return {src: '', alt: '', width: 0, height: 0};
+            }
+            return {
+                src: img.currentSrc || img.src || '',
+                alt: img.getAttribute('alt') || '',
+                width: parseInt(img.dataset.width || img.naturalWidth || 0),
+                height: parseInt(img.dataset.height || img.naturalHeight || 0)
+            };
+        });
+    """
+
+    def extract_grid_data(self):
+        """
+        Read every grid cell's image URL, prompt and dimensions in one script call.
+        The modal is only opened for cells missing one of `required_fields`.
+        """
+        cells = self.driver.execute_script(self.GRID_SCRIPT, self.image_limit) or []
+        
+        images_data = []
+        for index, cell in enumerate(cells):
+            image_data = {
+                'prompt': cell.get('alt', ''),
+                'model': '',
+                'image_url': self.get_full_resolution_url(cell.get('src', '')),
+                'dimensions': f"{cell['width']} x {cell['height']}" if cell.get('width') and cell.get('height') else ''
+            }
+            
+            missing = [field for field in self.required_fields if not image_data.get(field)]
+            if missing:
+                print(f"Opening image {index + 1} to read {', '.join(missing)}...")
+                try:
+                    self.driver.find_elements(By.CSS_SELECTOR, 'div[role="gridcell"]')[index].click()
+                    modal_data = self.extract_modal_data() or {}
+                    for field, value in modal_data.items():
+                        if value and not image_data.get(field):
+                            image_data[field] = value
+                except Exception as e:
+                    print(f"Error processing image: {str(e)}")
+            
+            if image_data['image_url']:
+                images_data.append(image_data)
+        
+        return images_data
+
+    def _search_with_browser(self, search_query):
         try:
             self.ensure_driver_active()
             encoded_query = urllib.parse.quote(search_query)
@@ -144,6 +363,9 @@ class LexicaScraper:
             self.driver.get(query_url)
             self.wait_for_images_to_load()
             
+            if self.bulk_extract:
+                return self.extract_grid_data()
+            
             image_cells = self.driver.find_elements(By.CSS_SELECTOR, 'div[role="gridcell"]')
             image_cells = image_cells[:self.image_limit]
             
@@ -195,8 +417,9 @@ class LexicaScraper:
     def close(self):
         """Close the browser"""
         try:
-            if hasattr(self, 'driver'):
+            if getattr(self, 'driver', None) is not None:
                 self.driver.quit()
+                self.driver = None
         except:
             pass  # Ignore errors during close
 
@@ -204,6 +427,184 @@ class LexicaScraper:
         """Destructor to ensure browser is closed"""
         self.close()
 
+class LexicaScraperPool:
+    """
+    Pool of headless LexicaScraper instances serving searches concurrently.
+
+    Each browser gets its own debugging port. Browsers that stop responding,
+    or that have served `max_uses` searches, are replaced with fresh ones.
+    The pool exposes the same `search_and_scrape` method as LexicaScraper
+    and can be used in its place.
+    """
+
+    def __init__(self, size=None, image_limit=10, headless=True, max_uses=50, backend="auto"):
+        self.size = size or min(4, os.cpu_count() or 1)
+        self.image_limit = image_limit
+        self.headless = headless
+        self.backend = backend
+        self.max_uses = max_uses
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="lexica")
+
+        # Start the browsers in parallel, Chrome takes a while to launch
+        for scraper in self._executor.map(lambda _: self._new_scraper(), range(self.size)):
+            self._idle.put(scraper)
+
+    def _new_scraper(self):
+        scraper = LexicaScraper(image_limit=self.image_limit, headless=self.headless, backend=self.backend)
+        with self._lock:
+            self._uses[id(scraper)] = 0
+        return scraper
+
+    def _recycle(self, scraper):
+        with self._lock:
+            self._uses.pop(id(scraper), None)
+        scraper.close()
+        return self._new_scraper()
+
+    def _acquire(self):
+        scraper = self._idle.get()
+        if not scraper.is_healthy():
+            print("Replacing unresponsive WebDriver...")
+            try:
+                scraper = self._recycle(scraper)
+            except Exception:
+                # Give the slot back so the pool doesn't shrink
+                self._idle.put(scraper)
+                raise
+        return scraper
+
+    def _release(self, scraper):
+        with self._lock:
+            self._uses[id(scraper)] = self._uses.get(id(scraper), 0) + 1
+            worn_out = self._uses[id(scraper)] >= self.max_uses
+        if worn_out and not self._closed:
+            try:
+                scraper = self._recycle(scraper)
+            except Exception as e:
+                print(f"Error recycling WebDriver: {str(e)}")
+        self._idle.put(scraper)
+
+    def search_and_scrape(self, search_query):
+        """Run a search on the next free browser"""
+        scraper = self._acquire()
+        try:
+            return scraper.search_and_scrape(search_query)
+        finally:
+            self._release(scraper)
+
+    def submit(self, search_query):
+        """Schedule a search and return a Future with its results"""
+        return self._executor.submit(self.search_and_scrape, search_query)
+
+    def map(self, search_queries):
+        """Run several searches concurrently, returning results in query order"""
+        return list(self._executor.map(self.search_and_scrape, search_queries))
+
+    def close(self):
+        """Close all browsers in the pool"""
+        if getattr(self, '_closed', True):
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __del__(self):
+        self.close()
+
+class CachedLexicaScraper:
+    """
+    Persistent query cache in front of a LexicaScraper or LexicaScraperPool.
+
+    Results are keyed on the normalized query text and image limit. Entries
+    younger than `ttl` are served directly. Once older than `ttl`, an entry
+    is still served for up to `stale_ttl` more seconds while a background
+    refresh fetches new results (stale-while-revalidate), so entries are
+    kept for `ttl + stale_ttl` in total. Empty results aren't cached.
+    """
+
+    def __init__(self, scraper, cache=None, ttl=7 * 24 * 3600, stale_ttl=30 * 24 * 3600):
+        self.scraper = scraper
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.cache = cache if cache is not None else SQLiteCache(
+            namespace="lexica",
+            ttl=ttl + stale_ttl,
+            max_entries=20000
+        )
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        # A single browser can't serve a foreground search and a refresh at once
+        self._scraper_lock = None if isinstance(scraper, LexicaScraperPool) else threading.Lock()
+
+    @property
+    def image_limit(self):
+        return self.scraper.image_limit
+
+    @staticmethod
+    def normalize_query(search_query):
+        return " ".join(search_query.lower().split())
+
+    def _key(self, search_query):
+        return hash_key("lexica", self.normalize_query(search_query), self.image_limit)
+
+    def _fetch(self, search_query, key):
+        if self._scraper_lock is not None:
+            with self._scraper_lock:
+                images = self.scraper.search_and_scrape(search_query)
+        else:
+            images = self.scraper.search_and_scrape(search_query)
+        if images:
+            self.cache.set(key, {"images": images, "fetched_at": time.time()})
+        return images
+
+    def _refresh(self, search_query, key):
+        try:
+            self._fetch(search_query, key)
+        except Exception as e:
+            print(f"Error refreshing cached search '{search_query}': {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def search_and_scrape(self, search_query):
+        """Return cached results for the query, searching Lexica on a miss"""
+        key = self._key(search_query)
+        entry = self.cache.get(key)
+        # A cache passed in may keep entries longer than the stale window
+        if entry is not None and time.time() - entry["fetched_at"] >= self.ttl + self.stale_ttl:
+            entry = None
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age >= self.ttl:
+                with self._lock:
+                    start_refresh = key not in self._refreshing
+                    self._refreshing.add(key)
+                if start_refresh:
+                    threading.Thread(
+                        target=self._refresh,
+                        args=(search_query, key),
+                        name="lexica-refresh",
+                        daemon=True
+                    ).start()
+            return entry["images"]
+        
+        return self._fetch(search_query, key)
+
+    def stats(self):
+        """Return hit/miss statistics of the query cache"""
+        return self.cache.stats()
+
+    def close(self):
+        self.scraper.close()
+
 def main():
     scraper = LexicaScraper(image_limit=30, headless=True)  # Default to headless
     search_query = '{subject} in the style of futuristic robots...'
@@ -0,0 +1,98 @@
+"""
+Job manifest for incremental video re-renders
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+from .cache import hash_key
+
+
+def file_digest(path: str) -> str:
+    """sha256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RenderManifest:
+    """
+    What a render job produced last time, stored in `job_dir`.
+
+    Segment results (keywords and chosen images) are recorded by the hash of
+    their text, and every rendered segment's video is kept as a chunk named
+    after a fingerprint of everything that went into it. A re-run only
+    redoes segments whose text is new and re-encodes chunks whose
+    fingerprint changed; the rest is reused as is.
+    """
+
+    VERSION = 1
+
+    def __init__(self, job_dir: str):
+        self.job_dir = job_dir
+        self.chunk_dir = os.path.join(job_dir, "chunks")
+        os.makedirs(self.chunk_dir, exist_ok=True)
+        self.path = os.path.join(job_dir, "manifest.json")
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        empty = {"version": self.VERSION, "segments": {}, "chunks": {}, "timeline": []}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        if data.get("version") != self.VERSION:
+            print("Render manifest is from another version, starting over")
+            return empty
+        return data
+
+    def segment(self, text: str) -> Optional[Dict]:
+        """Keywords and images recorded for a segment's text, or None"""
+        return self._data["segments"].get(hash_key(text))
+
+    def set_segment(self, text: str, keywords: List[str], images: List[Dict]):
+        self._data["segments"][hash_key(text)] = {"keywords": keywords, "images": images}
+
+    @staticmethod
+    def fingerprint(*parts) -> str:
+        """Identify a chunk by everything that affects how it looks and sounds"""
+        return hash_key("chunk", *parts)
+
+    def chunk_path(self, fingerprint: str) -> str:
+        return os.path.join(self.chunk_dir, f"{fingerprint}.mp4")
+
+    def has_chunk(self, fingerprint: str) -> bool:
+        return fingerprint in self._data["chunks"] and os.path.exists(self.chunk_path(fingerprint))
+
+    def add_chunk(self, fingerprint: str, duration: float):
+        self._data["chunks"][fingerprint] = {"duration": duration}
+
+    def save(self, texts: Iterable[str], timeline: List[str]):
+        """
+        Record the current job and forget segments and chunks it no longer
+        uses, deleting their files.
+        """
+        keep_segments = {hash_key(text) for text in texts}
+        self._data["segments"] = {
+            key: value for key, value in self._data["segments"].items() if key in keep_segments
+        }
+        stale_chunks = set(self._data["chunks"]) - set(timeline)
+        for fingerprint in stale_chunks:
+            del self._data["chunks"][fingerprint]
+            try:
+                os.remove(self.chunk_path(fingerprint))
+            except OSError:
+                pass
+        self._data["timeline"] = timeline
+
+        # Write to a temp file first so an interrupted save never corrupts the manifest
+        fd, temp_path = tempfile.mkstemp(dir=self.job_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,103 @@
+"""
+Threaded stage pipeline connected by bounded queues
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries an exception from a stage down to the consumer"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class Pipeline:
+    """
+    Push items from a source iterator through a chain of stages.
+
+    Each stage runs in its own thread and hands its results to the next one
+    through a queue holding at most `queue_size` items, so stages overlap
+    while the number of items in flight stays bounded. Items keep their
+    order. A stage may return None to drop an item. The first exception
+    raised by the source or a stage is re-raised to the consumer.
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Any], Any]]], queue_size: int = 2):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+
+    def run(self, source: Iterable) -> Iterator:
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+
+        def put(q, item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def produce():
+            try:
+                for item in source:
+                    if not put(queues[0], item):
+                        return
+            except Exception as e:
+                put(queues[0], _Failure(e))
+                return
+            put(queues[0], _DONE)
+
+        def work(name, func, inbox, outbox):
+            while True:
+                item = get(inbox)
+                if item is _DONE or isinstance(item, _Failure):
+                    put(outbox, item)
+                    return
+                try:
+                    result = func(item)
+                except Exception as e:
+                    print(f"Error in {name} stage: {e}")
+                    put(outbox, _Failure(e))
+                    return
+                if result is not None:
+                    put(outbox, result)
+
+        threads = [threading.Thread(target=produce, name="pipeline-source", daemon=True)]
+        for index, (name, func) in enumerate(self.stages):
+            threads.append(threading.Thread(
+                target=work,
+                args=(name, func, queues[index], queues[index + 1]),
+                name=f"pipeline-{name}",
+                daemon=True
+            ))
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = get(queues[-1])
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                # The source may be blocked on network I/O, don't wait on it forever
+                thread.join(timeout=1)
@@ -1,17 +1,30 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+import asyncio
 import json
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
 from .providers import get_ai_provider
-from .lexica import LexicaScraper
+from .lexica import LexicaScraper, LexicaScraperPool, CachedLexicaScraper
+from .jsonstream import JSONArrayStreamParser
+from .pipeline import Pipeline
+from .images import ImageCache, FrameCache
+from .frames import letterbox, frame_buffer, black_frame
+from .workers import ImageProcessPool
+from .render import FFmpegRenderer, Shot, group_chunks, join_audio, trim
+from .profiles import RenderProfile, get_render_profile
+from .tts import TTSBackend, AudioCache, get_tts_backend
+from .audio import audio_duration
+from .manifest import RenderManifest, file_digest
+import math
 import random
-from gtts import gTTS
-from pydub import AudioSegment
 import os
+import shutil
+import tempfile
+import threading
 from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips
-import requests
-from io import BytesIO
 from PIL import Image
 import numpy as np
+from tqdm import tqdm
 
 @dataclass
 class ContentSegment:
@@ -26,29 +39,182 @@ class ContentProcessor:
         provider_name: str = "hyperbolic",
         api_key: str = None,
         model: str = "meta-llama/Llama-3.3-70B-Instruct",
-        max_images_per_segment: int = 2
+        max_images_per_segment: int = 2,
+        max_concurrency: int = 5,
+        keyword_batch_size: int = 1,
+        single_pass: bool = False,
+        stream_segments: bool = False,
+        scraper_pool_size: int = 1,
+        lexica_backend: str = "auto",
+        search_cache: bool = True,
+        image_cache: ImageCache = None,
+        frame_cache: FrameCache = None,
+        prefetch_workers: int = 8,
+        image_backend: str = "thread",
+        image_workers: int = None,
+        video_renderer: str = "moviepy",
+        transition: str = "fade",
+        render_workers: int = 1,
+        render_profile: Union[str, RenderProfile] = "default",
+        tts_backend: Union[str, TTSBackend] = "gtts",
+        tts_workers: int = 4,
+        tts_cache: AudioCache = None,
+        tts_options: Dict[str, Any] = None
     ):
         self.ai_provider = get_ai_provider(provider_name, api_key, model)
-        self.scraper = LexicaScraper(image_limit=max_images_per_segment+1, headless=True)
+        if scraper_pool_size > 1:
+            self.scraper = LexicaScraperPool(
+                size=scraper_pool_size,
+                image_limit=max_images_per_segment+1,
+                headless=True,
+                backend=lexica_backend
+            )
+        else:
+            self.scraper = LexicaScraper(
+                image_limit=max_images_per_segment+1,
+                headless=True,
+                backend=lexica_backend
+            )
+        if search_cache:
+            self.scraper = CachedLexicaScraper(self.scraper)
+        self.scraper_pool_size = scraper_pool_size
+        self.image_cache = image_cache or ImageCache()
+        self.frame_cache = frame_cache or FrameCache()
+        self.prefetch_workers = prefetch_workers
+        if image_backend not in ("thread", "process"):
+            raise ValueError(f"Unknown image backend: {image_backend}")
+        self.image_backend = image_backend
+        self.image_workers = image_workers
+        self._image_pool = None
+        if video_renderer not in ("moviepy", "ffmpeg"):
+            raise ValueError(f"Unknown video renderer: {video_renderer}")
+        self.video_renderer = video_renderer
+        self.transition = transition
+        self.render_workers = render_workers
+        self.render_profile = get_render_profile(render_profile)
+        if isinstance(tts_backend, str):
+            tts_backend = get_tts_backend(tts_backend, **(tts_options or {}))
+        self.tts_backend = tts_backend
+        self.tts_workers = max(1, tts_workers)
+        # None means the default on-disk cache, False disables caching
+        self.tts_cache = AudioCache() if tts_cache is None else tts_cache
         self.max_images_per_segment = max_images_per_segment
+        self.max_concurrency = max_concurrency
+        self.keyword_batch_size = max(1, keyword_batch_size)
+        self.single_pass = single_pass
+        self.stream_segments = stream_segments
         
         # Process content if provided
         if content:
             self.process_content(content)
 
-    def _split_into_segments(self, content: str) -> List[str]:
-        """Use AI to split content into logical segments"""
-        prompt = """Split the following content into logical segments for a video. 
+    SPLIT_PROMPT = """Split the following content into logical segments for a video. 
         Each segment should be a coherent thought or idea that can be illustrated with 1-3 images.
         Format your response as a JSON array of strings. For example:
         ["First segment text here", "Second segment text here", "Third segment text here"]
         
         Content:
         {content}
-        """.format(content=content)
+        """
+
+    KEYWORDS_PROMPT = """Generate 5 specific visual keywords or phrases that would work well as image generation prompts.
+        Focus on artistic styles, visual elements, and specific imagery that could be found in stock photos or AI art.
+        
+        Guidelines:
+        - Include specific art styles (e.g., 'digital art', 'photorealistic', 'cinematic')
+        - Mention specific visual elements (e.g., 'glowing particles', 'dramatic lighting')
+        - Avoid abstract concepts unless they have clear visual representations
+        - Include setting and environment details
+        - Consider composition elements
+        
+        Format your response as a JSON array of strings. For example:
+        ["cinematic urban landscape at night", "glowing digital interface with blue tones", "dramatic portrait with rim lighting"]
+        
+        Text to generate keywords for:
+        {segment}
+        """
 
+    BATCH_KEYWORDS_PROMPT = """For each numbered text below, generate 5 specific visual keywords or phrases that would work well as image generation prompts.
+        Focus on artistic styles, visual elements, and specific imagery that could be found in stock photos or AI art.
+        
+        Guidelines:
+        - Include specific art styles (e.g., 'digital art', 'photorealistic', 'cinematic')
+        - Mention specific visual elements (e.g., 'glowing particles', 'dramatic lighting')
+        - Avoid abstract concepts unless they have clear visual representations
+        - Include setting and environment details
+        - Consider composition elements
+        
+        Format your response as a JSON object mapping each text number to a JSON array of strings. For example:
+        {{"0": ["cinematic urban landscape at night", "dramatic portrait with rim lighting"], "1": ["glowing digital interface with blue tones", "misty forest at dawn"]}}
+        
+        Texts to generate keywords for:
+        {segments}
+        """
+
+    SPLIT_WITH_KEYWORDS_PROMPT = """Split the following content into logical segments for a video. 
+        Each segment should be a coherent thought or idea that can be illustrated with 1-3 images.
+        For each segment, also generate 5 specific visual keywords or phrases that would work well as image generation prompts.
+        
+        Guidelines for keywords:
+        - Include specific art styles (e.g., 'digital art', 'photorealistic', 'cinematic')
+        - Mention specific visual elements (e.g., 'glowing particles', 'dramatic lighting')
+        - Avoid abstract concepts unless they have clear visual representations
+        - Include setting and environment details
+        - Consider composition elements
+        
+        Format your response as a JSON array of objects with "text" and "keywords" fields. For example:
+        [{{"text": "First segment text here", "keywords": ["cinematic urban landscape at night", "dramatic portrait with rim lighting"]}}]
+        
+        Content:
+        {content}
+        """
+
+    def _split_into_segments(self, content: str) -> List[str]:
+        """Use AI to split content into logical segments"""
+        try:
+            response = self.ai_provider.get_response(self.SPLIT_PROMPT.format(content=content))
+        except Exception as e:
+            print(f"Error in split_into_segments: {e}")
+            return [content]
+        return self._parse_segments_response(response, content)
+
+    async def _asplit_into_segments(self, content: str) -> List[str]:
+        """Async variant of _split_into_segments"""
+        try:
+            response = await self.ai_provider.aget_response(self.SPLIT_PROMPT.format(content=content))
+        except Exception as e:
+            print(f"Error in split_into_segments: {e}")
+            return [content]
+        return self._parse_segments_response(response, content)
+
+    def _iter_segments(self, content: str) -> Iterator[str]:
+        """
+        Yield segments one by one as the AI provider streams them.
+        Falls back to the regular response parsing if no JSON array is streamed.
+        """
+        parser = JSONArrayStreamParser()
+        chunks = []
+        yielded = 0
+        try:
+            for chunk in self.ai_provider.stream_response(self.SPLIT_PROMPT.format(content=content)):
+                chunks.append(chunk)
+                for segment in parser.feed(chunk):
+                    if isinstance(segment, str) and segment.strip():
+                        yielded += 1
+                        yield segment
+        except Exception as e:
+            print(f"Error streaming segments: {e}")
+            if not yielded:
+                yield from self._split_into_segments(content)
+            return
+        
+        if not yielded:
+            response = {"choices": [{"message": {"content": "".join(chunks)}}]}
+            yield from self._parse_segments_response(response, content)
+
+    def _parse_segments_response(self, response: Dict, content: str) -> List[str]:
+        """Extract the list of segments from an AI response"""
         try:
-            response = self.ai_provider.get_response(prompt)
             if not response or 'choices' not in response:
                 raise ValueError("Invalid AI response format")
             
@@ -81,27 +247,180 @@ class ContentProcessor:
             print(f"Error in split_into_segments: {e}")
             return [content]
 
+    def _split_with_keywords(self, content: str) -> Optional[Tuple[List[str], List[List[str]]]]:
+        """
+        Split content and generate keywords in a single AI request.
+        Returns None if the response doesn't match the expected schema.
+        """
+        try:
+            response = self.ai_provider.get_response(self.SPLIT_WITH_KEYWORDS_PROMPT.format(content=content))
+            return self._parse_split_with_keywords_response(response)
+        except Exception as e:
+            print(f"Error in split_with_keywords, falling back to separate requests: {e}")
+            return None
+
+    async def _asplit_with_keywords(self, content: str) -> Optional[Tuple[List[str], List[List[str]]]]:
+        """Async variant of _split_with_keywords"""
+        try:
+            response = await self.ai_provider.aget_response(self.SPLIT_WITH_KEYWORDS_PROMPT.format(content=content))
+            return self._parse_split_with_keywords_response(response)
+        except Exception as e:
+            print(f"Error in split_with_keywords, falling back to separate requests: {e}")
+            return None
+
+    def _parse_split_with_keywords_response(self, response: Dict) -> Tuple[List[str], List[List[str]]]:
+        """Parse and validate a combined split + keywords response"""
+        if not response or 'choices' not in response:
+            raise ValueError("Invalid AI response format")
+        
+        response_content = response['choices'][0]['message']['content'].strip()
+        if not response_content.startswith('['):
+            import re
+            # Greedy match, the array contains nested keyword arrays
+            array_match = re.search(r'\[.*\]', response_content, re.DOTALL)
+            if not array_match:
+                raise ValueError("No JSON array found in response")
+            response_content = array_match.group(0)
+        
+        items = json.loads(response_content)
+        if not isinstance(items, list) or not items:
+            raise ValueError("Response is not a non-empty list")
+        
+        segments = []
+        all_keywords = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or set(item) != {"text", "keywords"}:
+                raise ValueError(f"Segment {index} must have exactly 'text' and 'keywords' fields")
+            text, keywords = item["text"], item["keywords"]
+            if not isinstance(text, str) or not text.strip():
+                raise ValueError(f"Segment {index} has no text")
+            if not isinstance(keywords, list) or not keywords or not all(isinstance(k, str) for k in keywords):
+                raise ValueError(f"Segment {index} keywords must be a non-empty list of strings")
+            segments.append(text.strip())
+            all_keywords.append(self._enhance_keywords(keywords))
+        
+        return segments, all_keywords
+
     def _generate_keywords(self, segment: str) -> List[str]:
         """Generate relevant keywords for image search based on segment content"""
-        prompt = """Generate 5 specific visual keywords or phrases that would work well as image generation prompts.
-        Focus on artistic styles, visual elements, and specific imagery that could be found in stock photos or AI art.
+        try:
+            response = self.ai_provider.get_response(self.KEYWORDS_PROMPT.format(segment=segment))
+        except Exception as e:
+            print(f"Error in generate_keywords: {e}")
+            return self._fallback_keywords()
+        return self._parse_keywords_response(response)
+
+    async def _agenerate_keywords(self, segment: str) -> List[str]:
+        """Async variant of _generate_keywords"""
+        try:
+            response = await self.ai_provider.aget_response(self.KEYWORDS_PROMPT.format(segment=segment))
+        except Exception as e:
+            print(f"Error in generate_keywords: {e}")
+            return self._fallback_keywords()
+        return self._parse_keywords_response(response)
+
+    def _batch_keywords_prompt(self, segments: List[str]) -> str:
+        numbered = "\n".join(f"[{index}] {segment}" for index, segment in enumerate(segments))
+        return self.BATCH_KEYWORDS_PROMPT.format(segments=numbered)
+
+    def _generate_keywords_batch(self, segments: List[str]) -> List[List[str]]:
+        """Generate keywords for several segments with a single AI request"""
+        try:
+            response = self.ai_provider.get_response(self._batch_keywords_prompt(segments))
+            batch_keywords = self._parse_batch_keywords_response(response, len(segments))
+        except Exception as e:
+            print(f"Error in generate_keywords_batch: {e}")
+            batch_keywords = [None] * len(segments)
         
-        Guidelines:
-        - Include specific art styles (e.g., 'digital art', 'photorealistic', 'cinematic')
-        - Mention specific visual elements (e.g., 'glowing particles', 'dramatic lighting')
-        - Avoid abstract concepts unless they have clear visual representations
-        - Include setting and environment details
-        - Consider composition elements
+        # Fall back to per-segment requests for anything the batch didn't cover
+        return [
+            keywords if keywords else self._generate_keywords(segment)
+            for segment, keywords in zip(segments, batch_keywords)
+        ]
+
+    async def _agenerate_keywords_batch(self, segments: List[str]) -> List[List[str]]:
+        """Async variant of _generate_keywords_batch"""
+        try:
+            response = await self.ai_provider.aget_response(self._batch_keywords_prompt(segments))
+            batch_keywords = self._parse_batch_keywords_response(response, len(segments))
+        except Exception as e:
+            print(f"Error in generate_keywords_batch: {e}")
+            batch_keywords = [None] * len(segments)
         
-        Format your response as a JSON array of strings. For example:
-        ["cinematic urban landscape at night", "glowing digital interface with blue tones", "dramatic portrait with rim lighting"]
+        return [
+            keywords if keywords else await self._agenerate_keywords(segment)
+            for segment, keywords in zip(segments, batch_keywords)
+        ]
+
+    def _parse_batch_keywords_response(self, response: Dict, count: int) -> List[List[str]]:
+        """
+        Extract per-segment keywords from a batched AI response.
+        Entries that are missing or malformed are returned as None.
+        """
+        if not response or 'choices' not in response:
+            raise ValueError("Invalid AI response format")
         
-        Text to generate keywords for:
-        {segment}
-        """.format(segment=segment)
+        response_content = response['choices'][0]['message']['content'].strip()
+        if not response_content.startswith('{'):
+            import re
+            object_match = re.search(r'\{.*\}', response_content, re.DOTALL)
+            if not object_match:
+                raise ValueError("No JSON object found in batched keywords response")
+            response_content = object_match.group(0)
+        
+        parsed = json.loads(response_content)
+        if not isinstance(parsed, dict):
+            raise ValueError("Response is not an object")
+        
+        batch_keywords = []
+        for index in range(count):
+            keywords = parsed.get(str(index))
+            if isinstance(keywords, list) and keywords and all(isinstance(k, str) for k in keywords):
+                batch_keywords.append(self._enhance_keywords(keywords))
+            else:
+                batch_keywords.append(None)
+        return batch_keywords
+
+    def _generate_all_keywords(self, segments: List[str]) -> List[List[str]]:
+        """Generate keywords for every segment, batching requests if configured"""
+        if self.keyword_batch_size == 1:
+            return [self._generate_keywords(segment) for segment in segments]
+        
+        all_keywords = []
+        for start in range(0, len(segments), self.keyword_batch_size):
+            all_keywords.extend(
+                self._generate_keywords_batch(segments[start:start + self.keyword_batch_size])
+            )
+        return all_keywords
 
+    async def _agenerate_all_keywords(self, segments: List[str], max_concurrency: int) -> List[List[str]]:
+        """Generate keywords for every segment concurrently, keeping segment order"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        batch_size = self.keyword_batch_size
+        batches = [segments[start:start + batch_size] for start in range(0, len(segments), batch_size)]
+        
+        async def keywords_for(batch):
+            async with semaphore:
+                if batch_size == 1:
+                    return [await self._agenerate_keywords(batch[0])]
+                return await self._agenerate_keywords_batch(batch)
+        
+        batch_results = await asyncio.gather(*(keywords_for(batch) for batch in batches))
+        return [keywords for batch in batch_results for keywords in batch]
+
+    def _fallback_keywords(self) -> List[str]:
+        """Keywords used when the AI provider fails"""
+        return [
+            "high quality illustration",
+            "detailed digital art",
+            "professional photo",
+            "cinematic scene",
+            "dramatic composition"
+        ]
+
+    def _parse_keywords_response(self, response: Dict) -> List[str]:
+        """Extract image-generation friendly keywords from an AI response"""
         try:
-            response = self.ai_provider.get_response(prompt)
             if not response or 'choices' not in response:
                 raise ValueError("Invalid AI response format")
             
@@ -128,17 +447,7 @@ class ContentProcessor:
             if not isinstance(keywords, list):
                 raise ValueError("Response is not a list")
             
-            # Ensure keywords are image-generation friendly
-            enhanced_keywords = []
-            for keyword in keywords:
-                # Add quality-enhancing prefixes if they're not present
-                if not any(term in keyword.lower() for term in ['high quality', 'detailed', 'professional', 'cinematic']):
-                    enhanced_keyword = f"high quality {keyword}"
-                else:
-                    enhanced_keyword = keyword
-                enhanced_keywords.append(enhanced_keyword)
-            
-            return enhanced_keywords[:5]  # Limit to 5 keywords
+            return self._enhance_keywords(keywords)
             
         except json.JSONDecodeError as e:
             print(f"Error parsing AI response for keywords: {e}")
@@ -152,13 +461,20 @@ class ContentProcessor:
             ]
         except Exception as e:
             print(f"Error in generate_keywords: {e}")
-            return [
-                "high quality illustration",
-                "detailed digital art",
-                "professional photo",
-                "cinematic scene",
-                "dramatic composition"
-            ]
+            return self._fallback_keywords()
+
+    def _enhance_keywords(self, keywords: List[str]) -> List[str]:
+        """Ensure keywords are image-generation friendly"""
+        enhanced_keywords = []
+        for keyword in keywords:
+            # Add quality-enhancing prefixes if they're not present
+            if not any(term in keyword.lower() for term in ['high quality', 'detailed', 'professional', 'cinematic']):
+                enhanced_keyword = f"high quality {keyword}"
+            else:
+                enhanced_keyword = keyword
+            enhanced_keywords.append(enhanced_keyword)
+        
+        return enhanced_keywords[:5]  # Limit to 5 keywords
 
     def _get_images_for_keywords(self, keywords: List[str]) -> List[Dict[str, Any]]:
         """Get images from Lexica based on keywords"""
@@ -182,53 +498,100 @@ class ContentProcessor:
             return random.sample(all_images, num_images)
         return []
 
+    def _build_segment(self, segment: str, keywords: List[str]) -> ContentSegment:
+        """Look up images for a segment and wrap it in a ContentSegment"""
+        try:
+            if not keywords:
+                keywords = [
+                    "high quality digital illustration",
+                    "cinematic composition",
+                    "professional photography",
+                    "detailed artwork",
+                    "dramatic scene"
+                ]
+            
+            # Get images based on keywords
+            images = self._get_images_for_keywords(keywords)
+            
+            return ContentSegment(
+                text=segment,
+                keywords=keywords,
+                images=images
+            )
+            
+        except Exception as e:
+            print(f"Error processing segment: {str(e)}")
+            # Add segment with fallback values
+            return ContentSegment(
+                text=segment,
+                keywords=["high quality digital art"],
+                images=[]
+            )
+
+    def _build_segments(self, segments: List[str], all_keywords: List[List[str]]) -> List[ContentSegment]:
+        """Look up images for all segments, concurrently when a scraper pool is available"""
+        if self.scraper_pool_size > 1:
+            with ThreadPoolExecutor(max_workers=self.scraper_pool_size) as executor:
+                return list(executor.map(self._build_segment, segments, all_keywords))
+        
+        # A single scraper drives one browser, so image lookup stays sequential
+        return [
+            self._build_segment(segment, keywords)
+            for segment, keywords in zip(segments, all_keywords)
+        ]
+
+    def _iter_segment_batches(self, content: str) -> Iterator[List[str]]:
+        """Group streamed segments into batches of keyword_batch_size"""
+        batch = []
+        for segment in self._iter_segments(content):
+            batch.append(segment)
+            if len(batch) == self.keyword_batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _process_streamed_segments(self, content: str) -> List[ContentSegment]:
+        """
+        Generate keywords and images for each segment while the split is still streaming.
+
+        The stream is read on its own thread, and keyword generation and image
+        lookup run as separate pipeline stages, so all three overlap.
+        """
+        stages = [
+            ("keywords", lambda batch: (batch, self._generate_all_keywords(batch))),
+            ("images", lambda item: self._build_segments(*item)),
+        ]
+        processed_segments = []
+        for segments in Pipeline(stages, queue_size=2).run(self._iter_segment_batches(content)):
+            processed_segments.extend(segments)
+        
+        if not processed_segments:
+            print("Warning: No segments generated, using full content as single segment")
+            processed_segments.append(
+                self._build_segment(content, self._generate_keywords(content))
+            )
+        return processed_segments
+
     def process_content(self, content: str) -> List[ContentSegment]:
         """Process content into segments with keywords and images"""
         try:
-            # Split content into segments
-            segments = self._split_into_segments(content)
-            if not segments:
-                print("Warning: No segments generated, using full content as single segment")
-                segments = [content]
-            
-            processed_segments = []
+            if self.stream_segments and not self.single_pass:
+                return self._process_streamed_segments(content)
             
-            for segment in segments:
-                try:
-                    # Generate keywords for the segment
-                    keywords = self._generate_keywords(segment)
-                    if not keywords:
-                        keywords = [
-                            "high quality digital illustration",
-                            "cinematic composition",
-                            "professional photography",
-                            "detailed artwork",
-                            "dramatic scene"
-                        ]
-                    
-                    # Get images based on keywords
-                    images = self._get_images_for_keywords(keywords)
-                    
-                    # Create segment object
-                    processed_segment = ContentSegment(
-                        text=segment,
-                        keywords=keywords,
-                        images=images
-                    )
-                    
-                    processed_segments.append(processed_segment)
-                    
-                except Exception as e:
-                    print(f"Error processing segment: {str(e)}")
-                    # Add segment with fallback values
-                    processed_segment = ContentSegment(
-                        text=segment,
-                        keywords=["high quality digital art"],
-                        images=[]
-                    )
-                    processed_segments.append(processed_segment)
+            split_result = self._split_with_keywords(content) if self.single_pass else None
+            if split_result:
+                segments, all_keywords = split_result
+            else:
+                # Split content into segments
+                segments = self._split_into_segments(content)
+                if not segments:
+                    print("Warning: No segments generated, using full content as single segment")
+                    segments = [content]
+                
+                all_keywords = self._generate_all_keywords(segments)
             
-            return processed_segments
+            return self._build_segments(segments, all_keywords)
             
         except Exception as e:
             print(f"Error in process_content: {str(e)}")
@@ -239,61 +602,143 @@ class ContentProcessor:
                 images=[]
             )]
 
-    def generate_speech_and_timing(self, processed_segments: List[ContentSegment]) -> List[Dict]:
+    async def aprocess_content(self, content: str, max_concurrency: int = None) -> List[ContentSegment]:
+        """
+        Async variant of process_content.
+
+        Keywords for all segments (or batches of segments) are generated
+        concurrently, with at most `max_concurrency` requests in flight.
+        Segments keep their original order.
+        """
+        max_concurrency = max_concurrency or self.max_concurrency
+        try:
+            split_result = await self._asplit_with_keywords(content) if self.single_pass else None
+            if split_result:
+                segments, all_keywords = split_result
+            else:
+                segments = await self._asplit_into_segments(content)
+                if not segments:
+                    print("Warning: No segments generated, using full content as single segment")
+                    segments = [content]
+                
+                all_keywords = await self._agenerate_all_keywords(segments, max_concurrency)
+            
+            return await asyncio.to_thread(self._build_segments, segments, all_keywords)
+            
+        except Exception as e:
+            print(f"Error in process_content: {str(e)}")
+            return [ContentSegment(
+                text=content,
+                keywords=["high quality digital art"],
+                images=[]
+            )]
+
+    def generate_speech_and_timing(self, processed_segments: List[ContentSegment], audio_dir: str = "audio_segments") -> List[Dict]:
         """
         Convert segments to speech and calculate timing information.
         Returns list of segments with audio paths and timing information.
+        Every segment's audio file is placed in `audio_dir`.
         """
         print("Generating speech and calculating timing...")
         
         # Create audio directory if it doesn't exist
-        audio_dir = "audio_segments"
         os.makedirs(audio_dir, exist_ok=True)
         
+        # Segments are synthesized concurrently, timing is laid out in order afterwards
+        with ThreadPoolExecutor(max_workers=self.tts_workers) as executor:
+            futures = [
+                executor.submit(self._synthesize_audio, i, segment, audio_dir)
+                for i, segment in enumerate(processed_segments)
+            ]
+            results = [future.result() for future in tqdm(futures, desc="Synthesizing speech", unit="segment")]
+        
         timed_segments = []
         current_time = 0  # Running time in milliseconds
         
-        for i, segment in enumerate(processed_segments):
-            try:
-                # Generate speech file
-                audio_path = os.path.join(audio_dir, f"segment_{i}.mp3")
-                tts = gTTS(text=segment.text, lang='en', slow=False)
-                tts.save(audio_path)
-                
-                # Load audio file to get duration
-                audio = AudioSegment.from_mp3(audio_path)
-                duration = len(audio)  # Duration in milliseconds
-                
-                # Create timed segment info
-                timed_segment = {
-                    "text": segment.text,
-                    "keywords": segment.keywords,
-                    "images": segment.images,
-                    "audio_path": audio_path,
-                    "start_time": current_time / 1000,  # Convert to seconds
-                    "end_time": (current_time + duration) / 1000,  # Convert to seconds
-                    "duration": duration / 1000  # Convert to seconds
-                }
-                
-                timed_segments.append(timed_segment)
-                current_time += duration
-                
-            except Exception as e:
-                print(f"Error processing segment {i}: {str(e)}")
-                # Add segment without audio if there's an error
-                timed_segment = {
-                    "text": segment.text,
-                    "keywords": segment.keywords,
-                    "images": segment.images,
-                    "audio_path": None,
-                    "start_time": current_time / 1000,
-                    "end_time": current_time / 1000,
-                    "duration": 0
-                }
-                timed_segments.append(timed_segment)
+        for segment, (audio_path, duration) in zip(processed_segments, results):
+            timed_segments.append(self._timed_segment(segment, audio_path, current_time, duration))
+            current_time += duration
         
         return timed_segments
 
+    def _synthesize_audio(self, index: int, segment: ContentSegment, audio_dir: str) -> Tuple[Optional[str], int]:
+        """
+        Convert a single segment to speech, reusing cached audio for unchanged text.
+        Returns the audio path and its duration in milliseconds, or (None, 0) on failure.
+        """
+        backend = self.tts_backend
+        key = AudioCache.key(backend, segment.text)
+        # Named after the content, so other jobs' segments can't overwrite it
+        audio_path = os.path.join(audio_dir, f"segment_{index}_{key[:12]}.{backend.extension}")
+        temp_path = None
+        try:
+            if self.tts_cache:
+                cached = self.tts_cache.get(key)
+                if cached is not None:
+                    cached_path, duration = cached
+                    return self._link_audio(cached_path, audio_path), duration
+                temp_path = self.tts_cache.temp_path(backend.extension)
+            else:
+                os.makedirs(audio_dir, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=audio_dir, suffix=f".tmp.{backend.extension}")
+                os.close(fd)
+            
+            # Generate speech into a private file so parallel jobs never share one
+            backend.synthesize(segment.text, temp_path)
+            
+            # Read the duration from the file's headers, no decoding needed
+            duration = round(audio_duration(temp_path) * 1000)  # Duration in milliseconds
+            
+            if self.tts_cache:
+                cached_path = self.tts_cache.put(key, temp_path, duration)
+                return self._link_audio(cached_path, audio_path), duration
+            os.replace(temp_path, audio_path)
+            return audio_path, duration
+            
+        except Exception as e:
+            print(f"Error processing segment {index}: {str(e)}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None, 0
+
+    @staticmethod
+    def _link_audio(cached_path: str, audio_path: str) -> str:
+        """
+        Give a job its own link to cached audio, so evicting the cache entry
+        never removes a file the job's saved content points to.
+        """
+        os.makedirs(os.path.dirname(audio_path) or ".", exist_ok=True)
+        if os.path.exists(audio_path):
+            return audio_path
+        temp_path = f"{audio_path}.{threading.get_ident()}.tmp"
+        try:
+            os.link(cached_path, temp_path)
+        except OSError:
+            # Different file system, or links aren't supported
+            shutil.copyfile(cached_path, temp_path)
+        os.replace(temp_path, audio_path)
+        return audio_path
+
+    def _timed_segment(self, segment: ContentSegment, audio_path: Optional[str], start_ms: int, duration: int) -> Dict:
+        """Segment info with its audio and position on the timeline"""
+        return {
+            "text": segment.text,
+            "keywords": segment.keywords,
+            "images": segment.images,
+            "audio_path": audio_path,
+            "start_time": start_ms / 1000,  # Convert to seconds
+            "end_time": (start_ms + duration) / 1000,  # Convert to seconds
+            "duration": duration / 1000  # Convert to seconds
+        }
+
+    def _synthesize_segment(self, index: int, segment: ContentSegment, start_ms: int, audio_dir: str) -> Tuple[Dict, int]:
+        """
+        Convert a single segment to speech.
+        Returns the timed segment and its duration in milliseconds.
+        """
+        audio_path, duration = self._synthesize_audio(index, segment, audio_dir)
+        return self._timed_segment(segment, audio_path, start_ms, duration), duration
+
     def save_processed_content(self, processed_segments: List[ContentSegment], filename: str):
         """Save processed content to JSON file with timing information"""
         # Generate speech and get timing information
@@ -307,148 +752,395 @@ class ContentProcessor:
         """Cleanup"""
         if hasattr(self, 'scraper'):
             self.scraper.close()
+        if getattr(self, '_image_pool', None) is not None:
+            self._image_pool.close()
+
+    def _black_frame(self) -> np.ndarray:
+        return black_frame(self.render_profile.width, self.render_profile.height)
+
+    def _frame_key(self, digest: str) -> str:
+        profile = self.render_profile
+        return FrameCache.key(digest, profile.size, profile.resample, profile.pad_color)
 
     def _download_and_resize_image(self, url: str) -> np.ndarray:
         """Download image from URL and convert to numpy array with proper video dimensions"""
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            img = Image.open(BytesIO(response.content))
-            
-            # Convert to RGB if image is in RGBA mode
-            if img.mode == 'RGBA':
-                img = img.convert('RGB')
-            
-            # Target dimensions
-            target_width = 1920
-            target_height = 1080
-            
-            # Calculate aspect ratios
-            target_ratio = target_width / target_height
-            image_ratio = img.size[0] / img.size[1]
-            
-            # Initialize dimensions for the resized image
-            new_width = target_width
-            new_height = target_height
-            
-            if image_ratio > target_ratio:
-                # Image is wider than 16:9
-                new_height = int(target_width / image_ratio)
-            else:
-                # Image is taller than 16:9
-                new_width = int(target_height * image_ratio)
-            
-            # Resize image
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Create black background
-            background = Image.new('RGB', (target_width, target_height), (0, 0, 0))
-            
-            # Calculate position to center the image
-            x = (target_width - new_width) // 2
-            y = (target_height - new_height) // 2
-            
-            # Paste resized image onto black background
-            background.paste(img, (x, y))
+            digest = self.image_cache.fetch_digest(url)
+            frame_key = self._frame_key(digest)
+            frame = self.frame_cache.get(frame_key)
+            if frame is not None:
+                return frame
             
-            return np.array(background)
+            profile = self.render_profile
+            with Image.open(self.image_cache.blob_path(digest)) as img:
+                # Compose into this thread's scratch buffer, the cache keeps the copy
+                frame = letterbox(
+                    img,
+                    profile.width,
+                    profile.height,
+                    out=frame_buffer(profile.width, profile.height),
+                    background=profile.pad_color,
+                    resample=profile.resample
+                )
+            return self.frame_cache.put(frame_key, frame)
             
         except Exception as e:
             print(f"Error downloading image: {e}")
             # Return a black frame as fallback
-            return np.zeros((1080, 1920, 3), dtype=np.uint8)
+            return self._black_frame()
 
-    def _create_full_audio(self, segments: List[Dict]) -> AudioFileClip:
-        """Create a single audio file from all segments"""
+    def _create_full_audio(self, segments: List[Dict], work_dir: str = ".") -> Optional[str]:
+        """Create a single audio file from all segments in `work_dir` and return its path"""
         print("Creating full audio narration...")
         
         # Combine all text
         full_text = " ".join(segment['text'] for segment in segments)
         
         # Create audio file
-        audio_path = "full_narration.mp3"
+        audio_path = os.path.join(work_dir, f"full_narration.{self.tts_backend.extension}")
         try:
-            tts = gTTS(text=full_text, lang='en', slow=False)
-            tts.save(audio_path)
-            
-            # Return audio clip
-            return AudioFileClip(audio_path)
+            return self.tts_backend.synthesize(full_text, audio_path)
         except Exception as e:
             print(f"Error creating audio: {e}")
             return None
 
-    def create_video(self, json_file: str, output_file: str = "output.mp4"):
-        """Create video from processed content with captions"""
-        print("Creating video...")
+    def _segment_images(self, segment: Dict) -> List[Dict]:
+        """Images actually shown for a segment"""
+        # Limit to maximum 2 images per segment to avoid quick transitions
+        return segment['images'][:2]
+
+    def _prefetch_images(self, segments: List[Dict]) -> Dict[str, np.ndarray]:
+        """Download and resize every image used by the segments concurrently"""
+        urls = []
+        for segment in segments:
+            for img_data in self._segment_images(segment):
+                if img_data.get('image_url') and img_data['image_url'] not in urls:
+                    urls.append(img_data['image_url'])
+        if not urls:
+            return {}
+        if self.image_backend == "process":
+            return self._prefetch_images_multiprocess(urls)
         
-        # Create temporary video without captions
-        temp_video = "temp_output.mp4"
+        frames = {}
+        with ThreadPoolExecutor(max_workers=self.prefetch_workers) as executor:
+            futures = {executor.submit(self._download_and_resize_image, url): url for url in urls}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Prefetching images", unit="img"):
+                frames[futures[future]] = future.result()
+        return frames
+
+    def _prefetch_images_multiprocess(self, urls: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Download images on threads, then decode and letterbox the ones not
+        already in the frame cache on a pool of worker processes.
+        """
+        frames = {}
+        digests = {}
+        with ThreadPoolExecutor(max_workers=self.prefetch_workers) as executor:
+            futures = {executor.submit(self.image_cache.fetch_digest, url): url for url in urls}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Downloading images", unit="img"):
+                url = futures[future]
+                try:
+                    digests[url] = future.result()
+                except Exception as e:
+                    print(f"Error downloading image: {e}")
+                    frames[url] = self._black_frame()
+        
+        # Several URLs may point at the same content, decode each image once
+        jobs = {}
+        for url, digest in digests.items():
+            frame = self.frame_cache.get(self._frame_key(digest))
+            if frame is not None:
+                frames[url] = frame
+            else:
+                jobs.setdefault(digest, []).append(url)
+        if not jobs:
+            return frames
+        
+        if self._image_pool is None:
+            self._image_pool = ImageProcessPool(workers=self.image_workers)
+        profile = self.render_profile
+        results = self._image_pool.letterbox_files(
+            ((digest, self.image_cache.blob_path(digest)) for digest in jobs),
+            lambda digest, frame: self.frame_cache.put(self._frame_key(digest), frame),
+            width=profile.width,
+            height=profile.height,
+            background=profile.pad_color,
+            resample=profile.resample
+        )
+        for digest, frame, error in tqdm(results, total=len(jobs), desc="Resizing images", unit="img"):
+            if error is not None:
+                print(f"Error resizing image: {error}")
+                frame = self._black_frame()
+            for url in jobs[digest]:
+                frames[url] = frame
+        return frames
+
+    def _segment_shots(self, segment: Dict, segment_duration: float, frames: Dict[str, np.ndarray] = None) -> List[Shot]:
+        """
+        Plan which images a segment shows and for how long, never past
+        `segment_duration`. Images missing from `frames` are downloaded on the spot.
+        """
+        frames = frames or {}
+        if not segment['images']:
+            # Show the shared black frame if no images
+            return [Shot("black", self._black_frame(), segment_duration)]
+        
+        images_to_use = self._segment_images(segment)
+        
+        # Calculate timing for images
+        time_per_image = segment_duration / len(images_to_use)
+        # Ensure each image shows for at least 3 seconds
+        time_per_image = max(time_per_image, 3.0)
+        # Add longer fade effects for smoother transitions
+        fade_duration = min(1.0, time_per_image / 3)
+        
+        shots = []
+        for img_data in images_to_use:
+            img_array = frames.get(img_data['image_url'])
+            if img_array is None:
+                img_array = self._download_and_resize_image(img_data['image_url'])
+            shots.append(Shot(img_data['image_url'], img_array, time_per_image, fade_duration))
+        
+        # If the images don't fill the segment, extend the last one
+        shown = time_per_image * len(shots)
+        if shown < segment_duration:
+            shots[-1].duration += segment_duration - shown
+        # Never run past the narration, even if that cuts an image short
+        return trim(shots, segment_duration)
+
+    def _build_segment_clip(self, segment: Dict, segment_duration: float, frames: Dict[str, np.ndarray] = None):
+        """
+        Build the video clip showing a segment's images for `segment_duration` seconds.
+        Images missing from `frames` are downloaded on the spot.
+        """
+        image_clips = []
+        for shot in self._segment_shots(segment, segment_duration, frames):
+            img_clip = ImageClip(shot.frame).set_duration(shot.duration)
+            if shot.fade:
+                img_clip = img_clip.fadein(shot.fade).fadeout(shot.fade)
+            image_clips.append(img_clip)
         
+        if len(image_clips) == 1:
+            return image_clips[0]
+        # Combine all image clips for this segment
+        return concatenate_videoclips(image_clips)
+
+    def _ffmpeg_renderer(self, workers: int = 1) -> FFmpegRenderer:
+        """
+        Renderer using the render profile's output settings, with its encoder
+        threads split among `workers` encodes running side by side.
+        """
+        profile = self.render_profile
+        return FFmpegRenderer(
+            fps=profile.fps,
+            codec=profile.codec,
+            audio_codec=profile.audio_codec,
+            preset=profile.preset,
+            bitrate=profile.bitrate,
+            threads=max(1, profile.threads // workers),
+            transition=self.transition
+        )
+
+    def _write_video(self, clip, output_file: str, **kwargs):
+        """Encode a clip with the render profile's output settings"""
+        profile = self.render_profile
+        clip.write_videofile(
+            output_file,
+            fps=profile.fps,
+            codec=profile.codec,
+            audio_codec=profile.audio_codec,
+            threads=profile.threads,
+            preset=profile.preset,
+            bitrate=profile.bitrate,
+            **kwargs
+        )
+
+    def _render_segment_video(self, timed_segment: Dict, output_file: str) -> Optional[str]:
+        """Render one timed segment with its narration to its own video file"""
+        duration = timed_segment['duration']
+        if not duration or not timed_segment.get('audio_path'):
+            return None
+        
+        audio = AudioFileClip(timed_segment['audio_path'])
+        clip = self._build_segment_clip(timed_segment, duration).set_duration(duration)
+        clip = clip.set_audio(audio)
+        try:
+            self._write_video(clip, output_file, logger=None)
+        finally:
+            clip.close()
+            audio.close()
+        return output_file
+
+    def stream(
+        self,
+        content: str,
+        output_dir: str = "segments",
+        queue_size: int = 2,
+        render: bool = True
+    ) -> Iterator[Dict]:
+        """
+        Process content as a pipeline, yielding each timed segment as soon as it's done.
+
+        Segments move through split -> keywords -> images -> speech -> rendering,
+        with every stage running in its own thread and linked to the next by a
+        queue of at most `queue_size` items. Each yielded dict has the same
+        fields as the entries written by save_processed_content, plus `index`
+        and, when `render` is True, the `video_path` of the rendered segment.
+        """
+        audio_dir = os.path.join(output_dir, "audio")
+        os.makedirs(audio_dir, exist_ok=True)
+        
+        def keywords_stage(item):
+            index, text = item
+            return index, text, self._generate_keywords(text)
+        
+        def images_stage(item):
+            index, text, keywords = item
+            return index, self._build_segment(text, keywords)
+        
+        elapsed = [0]  # Running time in milliseconds
+        
+        def speech_stage(item):
+            index, segment = item
+            timed_segment, duration = self._synthesize_segment(index, segment, elapsed[0], audio_dir)
+            elapsed[0] += duration
+            timed_segment['index'] = index
+            return timed_segment
+        
+        def render_stage(timed_segment):
+            output_file = os.path.join(output_dir, f"segment_{timed_segment['index']}.mp4")
+            try:
+                timed_segment['video_path'] = self._render_segment_video(timed_segment, output_file)
+            except Exception as e:
+                print(f"Error rendering segment {timed_segment['index']}: {e}")
+                timed_segment['video_path'] = None
+            return timed_segment
+        
+        stages = [
+            ("keywords", keywords_stage),
+            ("images", images_stage),
+            ("speech", speech_stage),
+        ]
+        if render:
+            stages.append(("render", render_stage))
+        
+        yield from Pipeline(stages, queue_size=queue_size).run(enumerate(self._iter_segments(content)))
+
+    def _text_ratio_durations(self, segments: List[Dict], total_duration: float) -> List[float]:
+        """Estimate segment durations from their share of the text"""
+        total_text_length = sum(len(seg['text']) for seg in segments)
+        return [(len(seg['text']) / total_text_length) * total_duration for seg in segments]
+
+    def _segment_audio_narration(
+        self,
+        segments: List[Dict],
+        json_file: str,
+        output_path: str,
+        segment_gap: float = 0.0,
+        crossfade: float = 0.0
+    ) -> Optional[List[float]]:
+        """
+        Join the audio already synthesized for each segment into one narration.
+        Returns the exact on-screen duration of every segment, or None if some
+        segment has no usable audio.
+        """
+        audio_paths = []
+        for segment in segments:
+            path = segment.get('audio_path')
+            if path and not os.path.isabs(path) and not os.path.exists(path):
+                # Paths are recorded relative to where the content was saved
+                path = os.path.join(os.path.dirname(os.path.abspath(json_file)), path)
+            if not path or not os.path.exists(path) or not segment.get('duration'):
+                return None
+            audio_paths.append(path)
+        
+        try:
+            join_audio(audio_paths, output_path, gap=segment_gap, crossfade=crossfade)
+        except Exception as e:
+            print(f"Error joining segment audio: {e}")
+            return None
+        
+        # Each segment stays on screen through the pause or crossfade that follows it
+        step = segment_gap - crossfade
+        durations = [segment['duration'] + step for segment in segments[:-1]]
+        durations.append(segments[-1]['duration'])
+        return durations
+
+    def _create_video_ffmpeg(self, segments: List[Dict], frames: Dict[str, np.ndarray], durations: List[float], audio_path: str, output_file: str):
+        """Encode the whole video in one ffmpeg process instead of frame by frame through moviepy"""
+        segment_shots = []
+        for segment, segment_duration in zip(segments, durations):
+            try:
+                segment_shots.append(self._segment_shots(segment, segment_duration, frames))
+            except Exception as e:
+                print(f"Error processing segment: {e}")
+                continue
+        
+        renderer = self._ffmpeg_renderer()
+        if self.render_workers > 1:
+            # A few chunks per worker keeps them all busy when lengths vary
+            chunks = group_chunks(segment_shots, self.render_workers * 2)
+            renderer.render_chunked(chunks, output_file, audio_path=audio_path, workers=self.render_workers)
+        else:
+            shots = [shot for shots in segment_shots for shot in shots]
+            renderer.render(shots, output_file, audio_path=audio_path)
+
+    def create_video(
+        self,
+        json_file: str,
+        output_file: str = "output.mp4",
+        reuse_segment_audio: bool = True,
+        segment_gap: float = 0.0,
+        crossfade: float = 0.0
+    ):
+        """
+        Create video from processed content with captions.
+
+        By default the narration is assembled from the per-segment audio
+        recorded by save_processed_content, separated by `segment_gap`
+        seconds of silence or overlapped by `crossfade` seconds, and images
+        follow the recorded durations exactly. If that audio is missing, or
+        `reuse_segment_audio` is False, the whole text is synthesized again
+        and segment timing is estimated from text length.
+        """
+        print("Creating video...")
+        
+        full_audio = None
+        video_clips = []
+        # The narration lives in a private directory so concurrent jobs can't overwrite it
+        work_dir = tempfile.mkdtemp(prefix="scraperly-narration-")
         try:
             # Load processed content
             with open(json_file, 'r') as f:
                 segments = json.load(f)
             
-            # Create full audio narration
-            full_audio = self._create_full_audio(segments)
-            if full_audio is None:
-                print("Failed to create audio narration")
+            durations = None
+            if reuse_segment_audio:
+                audio_path = os.path.join(work_dir, "full_narration.wav")
+                durations = self._segment_audio_narration(segments, json_file, audio_path, segment_gap, crossfade)
+                if durations is None:
+                    print("Segment audio unavailable, synthesizing full narration")
+            
+            if durations is None:
+                # Create full audio narration
+                audio_path = self._create_full_audio(segments, work_dir)
+                if audio_path is None:
+                    print("Failed to create audio narration")
+                    return
+                durations = self._text_ratio_durations(segments, audio_duration(audio_path))
+            
+            frames = self._prefetch_images(segments)
+            
+            if self.video_renderer == "ffmpeg":
+                self._create_video_ffmpeg(segments, frames, durations, audio_path, output_file)
+                print(f"Video created successfully: {output_file}")
                 return
             
-            total_duration = full_audio.duration
-            video_clips = []
-            current_time = 0
+            full_audio = AudioFileClip(audio_path)
             
-            for segment in segments:
+            for segment, segment_duration in zip(segments, durations):
                 try:
-                    # Calculate segment duration based on text length ratio
-                    segment_text_length = len(segment['text'])
-                    total_text_length = sum(len(seg['text']) for seg in segments)
-                    segment_duration = (segment_text_length / total_text_length) * total_duration
-                    
-                    # Process images for this segment
-                    if segment['images']:
-                        # Limit to maximum 2 images per segment to avoid quick transitions
-                        images_to_use = segment['images'][:2]
-                        image_clips = []
-                        
-                        # Calculate timing for images
-                        time_per_image = segment_duration / len(images_to_use)
-                        # Ensure each image shows for at least 3 seconds
-                        time_per_image = max(time_per_image, 3.0)
-                        
-                        for i, img_data in enumerate(images_to_use):
-                            # Download and create image clip
-                            img_array = self._download_and_resize_image(img_data['image_url'])
-                            img_clip = ImageClip(img_array)
-                            
-                            # Set duration for this image
-                            img_clip = img_clip.set_duration(time_per_image)
-                            
-                            # Add longer fade effects for smoother transitions
-                            fade_duration = min(1.0, time_per_image / 3)
-                            img_clip = img_clip.fadein(fade_duration).fadeout(fade_duration)
-                            
-                            image_clips.append(img_clip)
-                        
-                        # Combine all image clips for this segment
-                        video_segment = concatenate_videoclips(image_clips)
-                        
-                        # If video segment is shorter than segment duration, extend last image
-                        if video_segment.duration < segment_duration:
-                            last_image = image_clips[-1]
-                            extended_duration = segment_duration - video_segment.duration
-                            last_image = last_image.set_duration(last_image.duration + extended_duration)
-                            image_clips[-1] = last_image
-                            video_segment = concatenate_videoclips(image_clips)
-                    else:
-                        # Create black frame if no images
-                        black_frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
-                        video_segment = ImageClip(black_frame).set_duration(segment_duration)
-                    
-                    video_clips.append(video_segment)
-                    current_time += segment_duration
-                    
+                    video_clips.append(self._build_segment_clip(segment, segment_duration, frames))
                 except Exception as e:
                     print(f"Error processing segment: {e}")
                     continue
@@ -461,25 +1153,8 @@ class ContentProcessor:
                 final_video = final_video.set_audio(full_audio)
                 
                 # Write final video with higher quality settings
-                final_video.write_videofile(
-                    output_file,
-                    fps=30,
-                    codec='libx264',
-                    audio_codec='aac',
-                    threads=4,
-                    preset='medium',
-                    bitrate='4000k'
-                )
-                
-                # Clean up
+                self._write_video(final_video, output_file)
                 final_video.close()
-                full_audio.close()
-                for clip in video_clips:
-                    clip.close()
-                
-                # Remove temporary audio file
-                if os.path.exists("full_narration.mp3"):
-                    os.remove("full_narration.mp3")
                 
             except Exception as e:
                 print(f"Error creating final video: {e}")
@@ -491,9 +1166,106 @@ class ContentProcessor:
             print(f"Error creating video: {e}")
             raise
         finally:
-            # Ensure temporary file is removed
-            if os.path.exists(temp_video):
-                try:
-                    os.remove(temp_video)
-                except:
-                    pass 
\ No newline at end of file
+            # Clean up
+            if full_audio is not None:
+                full_audio.close()
+            for clip in video_clips:
+                clip.close()
+            # Remove temporary audio files
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def render_incremental(self, content: str, output_file: str = "output.mp4", job_dir: str = "render_job") -> List[Dict]:
+        """
+        Turn content into a video, reusing whatever an earlier run with the
+        same `job_dir` already produced.
+
+        Keywords and images are looked up only for segments whose text is new,
+        speech comes from the audio cache for unchanged text, and each segment
+        is encoded into its own chunk named after a fingerprint of its text,
+        keywords, images, audio and render settings. Only chunks whose
+        fingerprint changed are encoded again before all chunks are joined.
+        Segments cut to each other, crossfades do not cross segment boundaries.
+        Returns the timed segments, each with the `video_path` of its chunk.
+        """
+        manifest = RenderManifest(job_dir)
+        profile = self.render_profile
+        renderer = self._ffmpeg_renderer(workers=self.render_workers)
+        
+        texts = self._split_into_segments(content)
+        if not texts:
+            print("Warning: No segments generated, using full content as single segment")
+            texts = [content]
+        
+        # Only segments with new text need keywords and images
+        new_texts = list(dict.fromkeys(text for text in texts if manifest.segment(text) is None))
+        if new_texts:
+            for segment in self._build_segments(new_texts, self._generate_all_keywords(new_texts)):
+                manifest.set_segment(segment.text, segment.keywords, segment.images)
+        print(f"Reusing {len(texts) - len(new_texts)} of {len(texts)} segments")
+        
+        processed_segments = []
+        for text in texts:
+            recorded = manifest.segment(text)
+            processed_segments.append(ContentSegment(text=text, keywords=recorded["keywords"], images=recorded["images"]))
+        audio_dir = os.path.join(job_dir, "audio")
+        timed_segments = self.generate_speech_and_timing(processed_segments, audio_dir)
+        
+        segments, durations, timeline, pending = [], [], [], {}
+        for index, segment in enumerate(timed_segments):
+            if not segment['audio_path'] or not segment['duration']:
+                print(f"Skipping segment {index}, it has no audio")
+                segment['video_path'] = None
+                continue
+            # Whole frames, so chunks and narration stay in sync when joined
+            duration = math.ceil(segment['duration'] * profile.fps - 1e-6) / profile.fps
+            fingerprint = RenderManifest.fingerprint(
+                segment['text'],
+                segment['keywords'],
+                [img.get('image_url') for img in self._segment_images(segment)],
+                file_digest(segment['audio_path']),
+                duration,
+                asdict(profile),
+                self.transition
+            )
+            segment['video_path'] = manifest.chunk_path(fingerprint)
+            if not manifest.has_chunk(fingerprint):
+                pending[fingerprint] = (segment, duration)
+            segments.append(segment)
+            durations.append(duration)
+            timeline.append(fingerprint)
+        if not segments:
+            print("No segment could be rendered")
+            return timed_segments
+        
+        print(f"Encoding {len(pending)} of {len(segments)} chunks")
+        frames = self._prefetch_images([segment for segment, _ in pending.values()])
+        
+        def encode_chunk(fingerprint):
+            segment, duration = pending[fingerprint]
+            chunk_path = manifest.chunk_path(fingerprint)
+            # Encode next to the chunk and rename, so an interrupted run never leaves half a chunk
+            partial_path = chunk_path[:-len(".mp4")] + ".partial.mp4"
+            renderer.render(self._segment_shots(segment, duration, frames), partial_path)
+            os.replace(partial_path, chunk_path)
+            return fingerprint, duration
+        
+        with ThreadPoolExecutor(max_workers=self.render_workers) as executor:
+            for fingerprint, duration in tqdm(
+                executor.map(encode_chunk, list(pending)), total=len(pending), desc="Encoding chunks", unit="chunk"
+            ):
+                manifest.add_chunk(fingerprint, duration)
+        
+        narration_path = os.path.join(job_dir, "narration.wav")
+        join_audio([segment['audio_path'] for segment in segments], narration_path, durations=durations)
+        renderer.join_chunks([segment['video_path'] for segment in segments], output_file, narration_path)
+        
+        manifest.save(texts, timeline)
+        # Drop audio of segments the job no longer has
+        in_use = {os.path.basename(segment['audio_path']) for segment in timed_segments if segment['audio_path']}
+        for name in os.listdir(audio_dir):
+            if name not in in_use:
+                os.remove(os.path.join(audio_dir, name))
+        with open(os.path.join(job_dir, "processed_content.json"), 'w', encoding='utf-8') as f:
+            json.dump(timed_segments, f, indent=2, ensure_ascii=False)
+        print(f"Video created successfully: {output_file}")
+        return timed_segments
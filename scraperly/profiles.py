@@ -0,0 +1,59 @@
+"""
+Render profiles describing output resolution and encoder settings
+"""
+
+from dataclasses import dataclass, replace
+from typing import Tuple, Union
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Target frame size, frame rate and encoder settings for a rendered video"""
+    width: int = 1920
+    height: int = 1080
+    fps: int = 30
+    codec: str = "libx264"
+    audio_codec: str = "aac"
+    preset: str = "medium"
+    bitrate: str = "4000k"
+    threads: int = 4
+    resample: str = "lanczos"
+    pad_color: Tuple[int, int, int] = (0, 0, 0)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    def with_options(self, **overrides) -> "RenderProfile":
+        """Return a copy of this profile with some settings changed"""
+        return replace(self, **overrides)
+
+
+RENDER_PROFILES = {
+    "default": RenderProfile(),
+    # Quick previews: small frames, few of them, fastest encoder settings
+    "draft": RenderProfile(
+        width=854,
+        height=480,
+        fps=12,
+        preset="ultrafast",
+        bitrate="800k",
+        resample="bilinear"
+    ),
+    "vertical-short": RenderProfile(width=1080, height=1920),
+    "archive": RenderProfile(preset="slow", bitrate="12000k"),
+}
+
+
+def get_render_profile(profile: Union[str, RenderProfile, None] = None) -> RenderProfile:
+    """Resolve a profile name or instance to a RenderProfile"""
+    if profile is None:
+        return RENDER_PROFILES["default"]
+    if isinstance(profile, RenderProfile):
+        return profile
+    try:
+        return RENDER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown render profile: {profile}. Available: {', '.join(RENDER_PROFILES)}"
+        )
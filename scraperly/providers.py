@@ -1,73 +1,291 @@
 from abc import ABC, abstractmethod
-import requests
+import asyncio
+import json
 import time
 import os
+from .cache import get_response_cache, hash_key
+from .transport import HTTPTransport, get_transport
+from .ratelimit import (
+    Backoff,
+    CircuitBreaker,
+    ProviderError,
+    RateLimitError,
+    get_rate_limiter,
+    is_rate_limit_error,
+    parse_retry_after,
+    retry_after_from,
+)
 
 class AIProvider(ABC):
     """Abstract base class for AI providers"""
-    
+
+    name = None
+
+    def __init__(
+        self,
+        model="default",
+        max_tokens=2048,
+        temperature=0.7,
+        cache=None,
+        rate_limiter=None,
+        backoff=None,
+        circuit_breaker=None
+    ):
+        """
+        Args:
+            model: Model name to use (provider-specific)
+            max_tokens: Maximum number of tokens in response
+            temperature: Temperature for response generation
+            cache: Response cache to use. Defaults to the shared on-disk cache,
+                pass False to disable caching.
+            rate_limiter: RateLimiter shared with other providers on the same quota (optional)
+            backoff: Backoff policy used between retries (optional)
+            circuit_breaker: CircuitBreaker guarding the provider (optional)
+        """
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        if cache is None:
+            cache = get_response_cache()
+        self.cache = cache or None
+        self.rate_limiter = rate_limiter
+        self.backoff = backoff or Backoff()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+    def _cache_key(self, prompt):
+        """Key responses on everything that affects the completion"""
+        return hash_key(self.name, self.model, self.temperature, self.max_tokens, prompt)
+
+    @staticmethod
+    def _estimate_tokens(text):
+        """Rough token count used for tokens-per-minute limiting"""
+        return len(text) // 4 + 1
+
     @abstractmethod
-    def get_response(self, prompt, retry_count=3):
-        """Get response from AI provider"""
+    def _complete(self, prompt):
+        """Send a single request and return the response in Hyperbolic format"""
         pass
 
-class HyperbolicAI(AIProvider):
+    def _on_success(self, key, result):
+        self.circuit_breaker.record_success()
+        if self.rate_limiter is not None:
+            content = result['choices'][0]['message']['content'] or ""
+            self.rate_limiter.consume(self._estimate_tokens(content))
+        if self.cache is not None:
+            self.cache.set(key, result)
+
+    def _on_failure(self, error, attempt):
+        """Record a failed attempt and return how long to wait before retrying"""
+        retry_after = retry_after_from(error)
+        if is_rate_limit_error(error):
+            # The provider is reachable, it's just asking us to slow down
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+        return self.backoff.delay(attempt, retry_after)
+
+    def get_response(self, prompt, retry_count=3):
+        """Get response from AI provider with rate limiting, retries and caching"""
+        key = self._cache_key(prompt)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        for attempt in range(retry_count):
+            self.circuit_breaker.before_call()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self._estimate_tokens(prompt))
+            try:
+                result = self._complete(prompt)
+                if result is None:
+                    raise ProviderError(f"Empty response from {self.name}")
+            except Exception as e:
+                delay = self._on_failure(e, attempt)
+                if attempt == retry_count - 1:
+                    raise e
+                time.sleep(delay)
+                continue
+
+            self._on_success(key, result)
+            return result
+
+        return None
+
+    def _stream(self, prompt):
+        """Yield response text chunks, providers override this with native streaming"""
+        yield self._complete(prompt)['choices'][0]['message']['content']
+
+    def stream_response(self, prompt, retry_count=3):
+        """
+        Yield the response text incrementally as the provider generates it.
+
+        Cached responses are yielded as a single chunk. Failures before the
+        first chunk are retried like get_response; once output has started,
+        errors are raised to the caller.
+        """
+        key = self._cache_key(prompt)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached['choices'][0]['message']['content']
+                return
+
+        for attempt in range(retry_count):
+            self.circuit_breaker.before_call()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self._estimate_tokens(prompt))
+            chunks = []
+            try:
+                for chunk in self._stream(prompt):
+                    if chunk:
+                        chunks.append(chunk)
+                        yield chunk
+            except Exception as e:
+                if chunks:
+                    self.circuit_breaker.record_failure()
+                    raise
+                delay = self._on_failure(e, attempt)
+                if attempt == retry_count - 1:
+                    raise e
+                time.sleep(delay)
+                continue
+
+            self._on_success(key, {
+                "choices": [{
+                    "message": {
+                        "content": "".join(chunks)
+                    }
+                }]
+            })
+            return
+
+    async def _acomplete(self, prompt):
+        """Async variant of _complete, runs the blocking call in a worker thread by default"""
+        return await asyncio.to_thread(self._complete, prompt)
+
+    async def aget_response(self, prompt, retry_count=3):
+        """Async variant of get_response"""
+        key = self._cache_key(prompt)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        for attempt in range(retry_count):
+            self.circuit_breaker.before_call()
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire(self._estimate_tokens(prompt))
+            try:
+                result = await self._acomplete(prompt)
+                if result is None:
+                    raise ProviderError(f"Empty response from {self.name}")
+            except Exception as e:
+                delay = self._on_failure(e, attempt)
+                if attempt == retry_count - 1:
+                    raise e
+                await asyncio.sleep(delay)
+                continue
+
+            self._on_success(key, result)
+            return result
+
+        return None
+
+    def cache_stats(self):
+        """Return hit/miss statistics of the response cache"""
+        if self.cache is None:
+            return {}
+        return self.cache.stats()
+
+class HTTPProvider(AIProvider):
+    """Base class for providers that talk to a plain HTTP API"""
+
+    def __init__(self, model="default", max_tokens=2048, temperature=0.7, transport=None, **kwargs):
+        super().__init__(model, max_tokens, temperature, **kwargs)
+        self.transport = transport if transport is not None else get_transport()
+
+    def _check_response(self, response):
+        """Raise for HTTP errors, turning 429 into RateLimitError"""
+        if response.status_code == 429:
+            raise RateLimitError(
+                f"{self.name} rate limit exceeded",
+                retry_after=parse_retry_after(response.headers.get("retry-after"))
+            )
+        if response.status_code >= 400:
+            raise ProviderError(f"{self.name} returned HTTP {response.status_code}: {response.text[:200]}")
+
+class HyperbolicAI(HTTPProvider):
     """Hyperbolic AI provider implementation"""
     
+    name = "hyperbolic"
+
     AVAILABLE_MODELS = {
         "deepseek-v3": "deepseek-ai/DeepSeek-V3",
         "deepseek-v2": "deepseek-ai/DeepSeek-V2",
         "default": "deepseek-ai/DeepSeek-V3"
     }
     
-    def __init__(self, api_key, model="default", max_tokens=5012, temperature=0.7):
+    def __init__(self, api_key, model="default", max_tokens=5012, temperature=0.7, **kwargs):
+        super().__init__(model, max_tokens, temperature, **kwargs)
         self.url = "https://api.hyperbolic.xyz/v1/chat/completions"
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {api_key}"
         }
-        self.model = model
-        self.max_tokens = max_tokens
-        self.temperature = temperature
-        self.cache = {}
 
-    def get_response(self, prompt, retry_count=3):
-        """Get response from Hyperbolic AI with retry mechanism and caching"""
-        if prompt in self.cache:
-            return self.cache[prompt]
-            
-        for attempt in range(retry_count):
-            try:
-                data = {
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "model": self.model,
-                    "max_tokens": self.max_tokens,
-                    "temperature": self.temperature,
-                    "top_p": 0.9
+    def _payload(self, prompt):
+        return {
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
                 }
-                
-                response = requests.post(self.url, headers=self.headers, json=data)
-                result = response.json()
-                
-                if 'choices' in result:
-                    self.cache[prompt] = result
-                    return result
-                    
-            except Exception as e:
-                if attempt == retry_count - 1:
-                    raise e
-                time.sleep(1)
-                
-        return None
+            ],
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "top_p": 0.9
+        }
+
+    def _complete(self, prompt):
+        """Get response from Hyperbolic AI"""
+        response = self.transport.post(self.url, headers=self.headers, json=self._payload(prompt))
+        return self._to_result(response)
+
+    async def _acomplete(self, prompt):
+        """Get response from Hyperbolic AI without blocking the event loop"""
+        response = await self.transport.apost(self.url, headers=self.headers, json=self._payload(prompt))
+        return self._to_result(response)
+
+    def _stream(self, prompt):
+        """Stream response from Hyperbolic AI as server-sent events"""
+        payload = dict(self._payload(prompt), stream=True)
+        with self.transport.stream_post(self.url, headers=self.headers, json=payload) as response:
+            self._check_response(response)
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if event.get("choices"):
+                    yield event["choices"][0].get("delta", {}).get("content") or ""
+
+    def _to_result(self, response):
+        self._check_response(response)
+        result = response.json()
+        
+        if 'choices' not in result:
+            raise ProviderError(f"Unexpected response from Hyperbolic: {str(result)[:200]}")
+        return result
 
 class OpenAIProvider(AIProvider):
     """OpenAI provider implementation"""
     
+    name = "openai"
+
     AVAILABLE_MODELS = {
         "gpt-4": "gpt-4",
         "gpt-3.5-turbo": "gpt-3.5-turbo",
@@ -75,56 +293,81 @@ class OpenAIProvider(AIProvider):
         "default": "gpt-4"
     }
     
-    def __init__(self, api_key, model="default", max_tokens=2048, temperature=0.7):
+    def __init__(self, api_key, model="default", max_tokens=2048, temperature=0.7, **kwargs):
         try:
             import openai
             self.openai = openai
             self.openai.api_key = api_key
         except ImportError:
             raise ImportError("OpenAI package not installed. Install with: pip install openai")
-        self.model = model
-        self.max_tokens = max_tokens
-        self.temperature = temperature
-        self.cache = {}
+        self.api_key = api_key
+        self._client = None
+        self._async_client = None
+        super().__init__(model, max_tokens, temperature, **kwargs)
 
-    def get_response(self, prompt, retry_count=3):
-        """Get response from OpenAI with retry mechanism and caching"""
-        if prompt in self.cache:
-            return self.cache[prompt]
-            
-        for attempt in range(retry_count):
-            try:
-                response = self.openai.ChatCompletion.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens
-                )
-                
-                # Convert OpenAI response format to match Hyperbolic format
-                result = {
-                    "choices": [{
-                        "message": {
-                            "content": response.choices[0].message.content
-                        }
-                    }]
+    def _complete(self, prompt):
+        """Get response from OpenAI"""
+        response = self.openai.ChatCompletion.create(
+            model=self.model,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=self.max_tokens
+        )
+        
+        # Convert OpenAI response format to match Hyperbolic format
+        return {
+            "choices": [{
+                "message": {
+                    "content": response.choices[0].message.content
                 }
-                
-                self.cache[prompt] = result
-                return result
-                
-            except Exception as e:
-                if attempt == retry_count - 1:
-                    raise e
-                time.sleep(1)
-                
-        return None
+            }]
+        }
+
+    def _stream(self, prompt):
+        """Stream response from OpenAI"""
+        if self._client is None:
+            self._client = self.openai.OpenAI(api_key=self.api_key)
+        stream = self._client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+
+    async def _acomplete(self, prompt):
+        """Get response from OpenAI using the async client"""
+        if self._async_client is None:
+            self._async_client = self.openai.AsyncOpenAI(api_key=self.api_key)
+        response = await self._async_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=self.max_tokens
+        )
+        
+        return {
+            "choices": [{
+                "message": {
+                    "content": response.choices[0].message.content
+                }
+            }]
+        }
 
 class AnthropicProvider(AIProvider):
     """Anthropic (Claude) provider implementation"""
     
+    name = "anthropic"
+
     AVAILABLE_MODELS = {
         "claude-3-opus": "claude-3-opus-20240229",
         "claude-3-sonnet": "claude-3-sonnet-20240229",
@@ -132,55 +375,71 @@ class AnthropicProvider(AIProvider):
         "default": "claude-3-sonnet-20240229"
     }
     
-    def __init__(self, api_key, model="default", max_tokens=2048, temperature=0.7):
+    def __init__(self, api_key, model="default", max_tokens=2048, temperature=0.7, **kwargs):
         try:
             import anthropic
             self.client = anthropic.Anthropic(api_key=api_key)
+            self.async_client = anthropic.AsyncAnthropic(api_key=api_key)
         except ImportError:
             raise ImportError("Anthropic package not installed. Install with: pip install anthropic")
-        self.model = model
-        self.max_tokens = max_tokens
-        self.temperature = temperature
-        self.cache = {}
+        super().__init__(model, max_tokens, temperature, **kwargs)
 
-    def get_response(self, prompt, retry_count=3):
-        """Get response from Claude with retry mechanism and caching"""
-        if prompt in self.cache:
-            return self.cache[prompt]
-            
-        for attempt in range(retry_count):
-            try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                
-                # Convert Anthropic response format to match Hyperbolic format
-                result = {
-                    "choices": [{
-                        "message": {
-                            "content": response.content[0].text
-                        }
-                    }]
+    def _complete(self, prompt):
+        """Get response from Claude"""
+        response = self.client.messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        
+        # Convert Anthropic response format to match Hyperbolic format
+        return {
+            "choices": [{
+                "message": {
+                    "content": response.content[0].text
                 }
-                
-                self.cache[prompt] = result
-                return result
-                
-            except Exception as e:
-                if attempt == retry_count - 1:
-                    raise e
-                time.sleep(1)
-                
-        return None
+            }]
+        }
+
+    def _stream(self, prompt):
+        """Stream response from Claude"""
+        with self.client.messages.stream(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        ) as stream:
+            yield from stream.text_stream
+
+    async def _acomplete(self, prompt):
+        """Get response from Claude using the async client"""
+        response = await self.async_client.messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        
+        return {
+            "choices": [{
+                "message": {
+                    "content": response.content[0].text
+                }
+            }]
+        }
 
-class OllamaProvider(AIProvider):
+class OllamaProvider(HTTPProvider):
     """Ollama local AI provider implementation"""
     
+    name = "ollama"
+
     AVAILABLE_MODELS = {
         "llama2": "llama2",
         "mistral": "mistral",
@@ -188,67 +447,78 @@ class OllamaProvider(AIProvider):
         "default": "llama2"
     }
     
-    def __init__(self, api_key, model="default", max_tokens=2048, temperature=0.7):
+    def __init__(self, api_key, model="default", max_tokens=2048, temperature=0.7, **kwargs):
         """Initialize Ollama provider
         
         Note: api_key is ignored since Ollama runs locally
         """
+        super().__init__(model, max_tokens, temperature, **kwargs)
         self.url = "http://localhost:11434/api/chat"
-        self.model = model
-        self.max_tokens = max_tokens
-        self.temperature = temperature
-        self.cache = {}
 
-    def get_response(self, prompt, retry_count=3):
-        """Get response from Ollama with retry mechanism and caching"""
-        if prompt in self.cache:
-            return self.cache[prompt]
-            
-        for attempt in range(retry_count):
-            try:
-                data = {
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "stream": False,
-                    "options": {
-                        "temperature": self.temperature,
-                        "num_predict": self.max_tokens
-                    }
+    def _payload(self, prompt):
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
                 }
-                
-                response = requests.post(self.url, json=data)
-                response_json = response.json()
-                
-                # Convert Ollama response format to match Hyperbolic format
-                result = {
-                    "choices": [{
-                        "message": {
-                            "content": response_json.get("message", {}).get("content", "")
-                        }
-                    }]
+            ],
+            "stream": False,
+            "options": {
+                "temperature": self.temperature,
+                "num_predict": self.max_tokens
+            }
+        }
+
+    def _complete(self, prompt):
+        """Get response from Ollama"""
+        response = self.transport.post(self.url, json=self._payload(prompt))
+        return self._to_result(response)
+
+    def _stream(self, prompt):
+        """Stream response from Ollama as newline-delimited JSON"""
+        payload = dict(self._payload(prompt), stream=True)
+        with self.transport.stream_post(self.url, json=payload) as response:
+            self._check_response(response)
+            for line in response.iter_lines():
+                event = json.loads(line)
+                yield event.get("message", {}).get("content", "")
+                if event.get("done"):
+                    break
+
+    async def _acomplete(self, prompt):
+        """Get response from Ollama without blocking the event loop"""
+        response = await self.transport.apost(self.url, json=self._payload(prompt))
+        return self._to_result(response)
+
+    def _to_result(self, response):
+        self._check_response(response)
+        response_json = response.json()
+        
+        # Convert Ollama response format to match Hyperbolic format
+        return {
+            "choices": [{
+                "message": {
+                    "content": response_json.get("message", {}).get("content", "")
                 }
-                
-                self.cache[prompt] = result
-                return result
-                
-            except Exception as e:
-                if attempt == retry_count - 1:
-                    raise e
-                time.sleep(1)
-                
-        return None
+            }]
+        }
 
 def get_ai_provider(
     provider_name: str, 
     api_key: str, 
     model: str = "default",
     max_tokens: int = None,
-    temperature: float = None
+    temperature: float = None,
+    cache=None,
+    transport: HTTPTransport = None,
+    timeout: float = None,
+    connect_timeout: float = None,
+    pool_maxsize: int = None,
+    http2: bool = False,
+    requests_per_minute: int = None,
+    tokens_per_minute: int = None
 ) -> AIProvider:
     """
     Factory function to get AI provider instance
@@ -259,6 +529,17 @@ def get_ai_provider(
         model: Model name to use (provider-specific)
         max_tokens: Maximum number of tokens in response (optional)
         temperature: Temperature for response generation (optional)
+        cache: Response cache shared by the provider (optional). Defaults to the
+            persistent on-disk cache; pass False to disable caching.
+        transport: HTTPTransport for HTTP-based providers (optional). When omitted,
+            a pooled transport shared with other providers using the same
+            options below is used.
+        timeout: Read timeout in seconds for HTTP-based providers (optional)
+        connect_timeout: Connect timeout in seconds for HTTP-based providers (optional)
+        pool_maxsize: Keep-alive connections per host for HTTP-based providers (optional)
+        http2: Use HTTP/2 when httpx[http2] is installed (optional)
+        requests_per_minute: Request quota shared by all providers of this kind (optional)
+        tokens_per_minute: Token quota shared by all providers of this kind (optional)
     """
     providers = {
         "hyperbolic": (HyperbolicAI, 20000, 0.1),
@@ -273,9 +554,28 @@ def get_ai_provider(
     
     provider_class, default_max_tokens, default_temp = provider_info
     
+    kwargs = {
+        "cache": cache,
+        "rate_limiter": get_rate_limiter(provider_name.lower(), requests_per_minute, tokens_per_minute),
+    }
+    if issubclass(provider_class, HTTPProvider):
+        if transport is None:
+            transport_options = {}
+            if timeout is not None:
+                transport_options["read_timeout"] = timeout
+            if connect_timeout is not None:
+                transport_options["connect_timeout"] = connect_timeout
+            if pool_maxsize is not None:
+                transport_options["pool_maxsize"] = pool_maxsize
+            if http2:
+                transport_options["http2"] = True
+            transport = get_transport(**transport_options)
+        kwargs["transport"] = transport
+    
     return provider_class(
         api_key, 
         model,
         max_tokens=max_tokens if max_tokens is not None else default_max_tokens,
-        temperature=temperature if temperature is not None else default_temp
+        temperature=temperature if temperature is not None else default_temp,
+        **kwargs
     ) 
\ No newline at end of file
@@ -0,0 +1,442 @@
+"""
+Static-image video rendering with a single ffmpeg process
+"""
+
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+import numpy as np
+from PIL import Image
+
+TRANSITIONS = ("fade", "crossfade", "none")
+
+# Longer filter graphs are passed through a script file to stay under
+# command line length limits
+_MAX_INLINE_FILTER = 8000
+
+
+@dataclass
+class Shot:
+    """One still image held on screen for `duration` seconds"""
+    key: str
+    frame: np.ndarray
+    duration: float
+    fade: float = 0.0
+
+
+def quantize(shots: List[Shot], fps: int, keep_empty: bool = False) -> List[Shot]:
+    """
+    Snap shot boundaries to whole frames along the running timeline, so the
+    rendered length always matches the summed durations.
+    """
+    quantized = []
+    start = 0.0
+    for shot in shots:
+        end = start + max(shot.duration, 0.0)
+        frames = round(end * fps) - round(start * fps)
+        start = end
+        if frames > 0 or keep_empty:
+            quantized.append(replace(shot, duration=frames / fps))
+    return quantized
+
+
+def trim(shots: List[Shot], duration: float) -> List[Shot]:
+    """Cut shots that run past `duration` seconds, shortening the last one kept"""
+    trimmed = []
+    start = 0.0
+    for shot in shots:
+        if start >= duration:
+            break
+        length = min(shot.duration, duration - start)
+        trimmed.append(replace(shot, duration=length, fade=min(shot.fade, length / 2)))
+        start += length
+    return trimmed
+
+
+def group_chunks(segments: List[List[Shot]], count: int) -> List[List[Shot]]:
+    """
+    Merge consecutive segments' shots into about `count` chunks of similar
+    duration, only ever splitting between segments.
+    """
+    total = sum(shot.duration for shots in segments for shot in shots)
+    target = total / max(1, count)
+    chunks, current, length = [], [], 0.0
+    for shots in segments:
+        current.extend(shots)
+        length += sum(shot.duration for shot in shots)
+        if length >= target:
+            chunks.append(current)
+            current, length = [], 0.0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def ffmpeg_executable() -> str:
+    """Path to the ffmpeg binary moviepy uses, or `ffmpeg` from PATH"""
+    try:
+        from imageio_ffmpeg import get_ffmpeg_exe
+        return get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+
+def join_audio(
+    paths: List[str],
+    output_file: str,
+    gap: float = 0.0,
+    crossfade: float = 0.0,
+    sample_rate: int = 44100,
+    ffmpeg: str = None,
+    durations: Optional[List[float]] = None
+) -> str:
+    """
+    Join audio files in order into one lossless file, with `gap` seconds of
+    silence after each file but the last, overlapped by `crossfade` seconds.
+    If `durations` is given, each file is instead padded with silence to
+    exactly its duration.
+    """
+    if not paths:
+        raise ValueError("No audio to join")
+    cmd = [ffmpeg or ffmpeg_executable(), "-y", "-hide_banner", "-loglevel", "error"]
+    for path in paths:
+        cmd += ["-i", path]
+
+    filters = []
+    for index in range(len(paths)):
+        # Bring every input to one format so they can be joined
+        chain = f"[{index}:a]aformat=sample_fmts=s16:sample_rates={sample_rate}:channel_layouts=mono"
+        if durations is not None:
+            chain += f",apad=whole_dur={durations[index]:.6f},atrim=end={durations[index]:.6f}"
+        elif gap > 0 and index < len(paths) - 1:
+            chain += f",apad=pad_dur={gap:.3f}"
+        filters.append(f"{chain}[a{index}]")
+
+    if len(paths) == 1:
+        filters.append("[a0]anull[aout]")
+    elif crossfade > 0:
+        previous = "a0"
+        for index in range(1, len(paths)):
+            out = "aout" if index == len(paths) - 1 else f"x{index}"
+            filters.append(f"[{previous}][a{index}]acrossfade=d={crossfade:.3f}[{out}]")
+            previous = out
+    else:
+        streams = "".join(f"[a{index}]" for index in range(len(paths)))
+        filters.append(f"{streams}concat=n={len(paths)}:v=0:a=1[aout]")
+
+    filter_graph = ";".join(filters)
+    with tempfile.TemporaryDirectory(prefix="scraperly-audio-") as work_dir:
+        if len(filter_graph) > _MAX_INLINE_FILTER:
+            script = os.path.join(work_dir, "filter.txt")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write(filter_graph)
+            cmd += ["-filter_complex_script", script]
+        else:
+            cmd += ["-filter_complex", filter_graph]
+        cmd += ["-map", "[aout]", output_file]
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        error = result.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"ffmpeg failed ({result.returncode}): {error[-2000:]}")
+    return output_file
+
+
+class FFmpegRenderer:
+    """
+    Render a sequence of still images to video without going through Python per frame.
+
+    Each distinct image is written to disk once. Durations and transitions
+    are described to ffmpeg as a filter graph (or a concat script when there
+    are no transitions) and the whole video, audio included, is encoded by a
+    single ffmpeg process.
+    """
+
+    def __init__(
+        self,
+        fps: int = 30,
+        codec: str = "libx264",
+        audio_codec: str = "aac",
+        preset: str = "medium",
+        bitrate: str = "4000k",
+        threads: int = 4,
+        transition: str = "fade",
+        ffmpeg: str = None
+    ):
+        """
+        Args:
+            fps: Output frame rate
+            codec: Video codec passed to ffmpeg
+            audio_codec: Audio codec passed to ffmpeg
+            preset: Encoder preset
+            bitrate: Target video bitrate
+            threads: Encoder threads
+            transition: "fade" fades each image in and out of black like the
+                moviepy renderer, "crossfade" blends consecutive images, and
+                "none" cuts between them
+            ffmpeg: Path to the ffmpeg binary, found automatically if not given
+        """
+        if transition not in TRANSITIONS:
+            raise ValueError(f"Unknown transition: {transition}")
+        self.fps = fps
+        self.codec = codec
+        self.audio_codec = audio_codec
+        self.preset = preset
+        self.bitrate = bitrate
+        self.threads = threads
+        self.transition = transition
+        self.ffmpeg = ffmpeg or ffmpeg_executable()
+
+    def render(self, shots: List[Shot], output_file: str, audio_path: Optional[str] = None) -> str:
+        """Encode `shots` back to back into `output_file`, muxing `audio_path` if given"""
+        shots = quantize(shots, self.fps)
+        if not shots:
+            raise ValueError("Nothing to render")
+
+        with tempfile.TemporaryDirectory(prefix="scraperly-render-") as work_dir:
+            paths = self._write_frames(shots, work_dir)
+            self._encode(shots, paths, output_file, work_dir, audio_path)
+        return output_file
+
+    def render_chunked(
+        self,
+        chunks: List[List[Shot]],
+        output_file: str,
+        audio_path: Optional[str] = None,
+        workers: int = None
+    ) -> str:
+        """
+        Encode each chunk in its own ffmpeg process, `workers` at a time, then
+        join them without re-encoding and mux `audio_path` once.
+
+        Chunks should start and end on segment boundaries. Transitions do not
+        cross chunk boundaries. The encoder threads are shared among the
+        workers so parallel encodes don't oversubscribe the CPU.
+        """
+        workers = workers or os.cpu_count() or 1
+        threads = max(1, self.threads // workers)
+        # Quantize the whole timeline at once so chunk lengths are whole
+        # frames and rounding never accumulates into audio drift
+        sizes = [len(chunk) for chunk in chunks]
+        timeline = quantize([shot for chunk in chunks for shot in chunk], self.fps, keep_empty=True)
+        chunks, offset = [], 0
+        for size in sizes:
+            chunk = [shot for shot in timeline[offset:offset + size] if shot.duration > 0]
+            offset += size
+            if chunk:
+                chunks.append(chunk)
+        if not chunks:
+            raise ValueError("Nothing to render")
+
+        with tempfile.TemporaryDirectory(prefix="scraperly-render-") as work_dir:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # Each ffmpeg runs as its own process, threads only wait on them
+                paths = self._write_frames([shot for chunk in chunks for shot in chunk], work_dir, executor)
+                futures = []
+                for index, chunk in enumerate(chunks):
+                    chunk_dir = os.path.join(work_dir, f"chunk_{index}")
+                    os.makedirs(chunk_dir)
+                    chunk_file = os.path.join(chunk_dir, "video.mp4")
+                    futures.append(executor.submit(
+                        self._encode, chunk, paths, chunk_file, chunk_dir, threads=threads
+                    ))
+                chunk_files = [future.result() for future in futures]
+            self.join_chunks(chunk_files, output_file, audio_path)
+        return output_file
+
+    def _run(self, cmd: List[str]):
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            error = result.stderr.decode("utf-8", "replace").strip()
+            raise RuntimeError(f"ffmpeg failed ({result.returncode}): {error[-2000:]}")
+
+    def _encode(
+        self,
+        shots: List[Shot],
+        paths: dict,
+        output_file: str,
+        work_dir: str,
+        audio_path: Optional[str] = None,
+        threads: Optional[int] = None
+    ) -> str:
+        """Run one ffmpeg process encoding `shots` from the frames in `paths`"""
+        if self.transition == "none":
+            input_args, filter_graph = self._concat_inputs(shots, paths, work_dir)
+        else:
+            input_args, filter_graph = self._filter_inputs(shots, paths)
+
+        cmd = [self.ffmpeg, "-y", "-hide_banner", "-loglevel", "error"] + input_args
+        audio_index = len([arg for arg in input_args if arg == "-i"])
+        if audio_path:
+            cmd += ["-i", audio_path]
+
+        if len(filter_graph) > _MAX_INLINE_FILTER:
+            script = os.path.join(work_dir, "filter.txt")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write(filter_graph)
+            cmd += ["-filter_complex_script", script]
+        else:
+            cmd += ["-filter_complex", filter_graph]
+
+        cmd += ["-map", "[vout]"]
+        if audio_path:
+            # Same rule as join_chunks: the video ends with the narration
+            cmd += ["-map", f"{audio_index}:a", "-c:a", self.audio_codec, "-shortest"]
+        cmd += [
+            "-c:v", self.codec,
+            "-preset", self.preset,
+            "-b:v", self.bitrate,
+            "-pix_fmt", "yuv420p",
+            "-r", str(self.fps),
+            "-threads", str(threads or self.threads),
+            # Same timescale in every chunk so they can be joined by stream copy
+            "-video_track_timescale", str(self.fps * 512),
+            "-t", f"{sum(shot.duration for shot in shots):.6f}",
+            "-movflags", "+faststart",
+            output_file
+        ]
+        self._run(cmd)
+        return output_file
+
+    def join_chunks(self, chunk_files: List[str], output_file: str, audio_path: Optional[str] = None) -> str:
+        """
+        Concatenate chunks encoded by this renderer's settings by stream copy
+        and add the audio track.
+        """
+        with tempfile.TemporaryDirectory(prefix="scraperly-join-") as work_dir:
+            script = os.path.join(work_dir, "chunks.txt")
+            with open(script, "w", encoding="utf-8") as f:
+                for chunk_file in chunk_files:
+                    f.write(f"file '{os.path.abspath(chunk_file)}'\n")
+            self._concat_copy(script, output_file, audio_path)
+        return output_file
+
+    def _concat_copy(self, script: str, output_file: str, audio_path: Optional[str] = None):
+        """Join the files listed in a concat script, cutting the video at the end of the audio"""
+        cmd = [self.ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+               "-f", "concat", "-safe", "0", "-i", script]
+        if audio_path:
+            cmd += ["-i", audio_path, "-map", "0:v", "-map", "1:a", "-c:a", self.audio_codec, "-shortest"]
+        cmd += ["-c:v", "copy", "-movflags", "+faststart", output_file]
+        self._run(cmd)
+
+    def _write_frames(self, shots: List[Shot], work_dir: str, executor=None) -> dict:
+        """Write each distinct frame to disk once, returning key -> path"""
+        paths = {}
+        jobs = []
+        for shot in shots:
+            if shot.key in paths:
+                continue
+            path = os.path.join(work_dir, f"frame_{len(paths)}.png")
+            paths[shot.key] = path
+            jobs.append((shot.frame, path))
+
+        def save(frame, path):
+            # Fast, light compression: these files only live for one encode
+            Image.fromarray(np.asarray(frame)).save(path, compress_level=1)
+
+        if executor is None:
+            for frame, path in jobs:
+                save(frame, path)
+        else:
+            for future in [executor.submit(save, frame, path) for frame, path in jobs]:
+                future.result()
+        return paths
+
+    def _concat_inputs(self, shots: List[Shot], paths: dict, work_dir: str):
+        """Hard cuts: a concat demuxer script with one entry per shot"""
+        script = os.path.join(work_dir, "shots.txt")
+        with open(script, "w", encoding="utf-8") as f:
+            for shot in shots:
+                f.write(f"file '{paths[shot.key]}'\nduration {shot.duration:.3f}\n")
+            # The demuxer ignores the last duration unless the file is repeated
+            f.write(f"file '{paths[shots[-1].key]}'\n")
+        input_args = ["-f", "concat", "-safe", "0", "-i", script]
+        return input_args, f"[0:v]fps={self.fps},format=yuv420p[vout]"
+
+    def _filter_inputs(self, shots: List[Shot], paths: dict):
+        """Fades: every distinct image is decoded once and looped inside the filter graph"""
+        keys = list(dict.fromkeys(shot.key for shot in shots))
+        input_args = []
+        for key in keys:
+            input_args += ["-framerate", str(self.fps), "-i", paths[key]]
+
+        # Images shown more than once are split into one stream per use
+        uses = {key: [] for key in keys}
+        for index, shot in enumerate(shots):
+            uses[shot.key].append(index)
+
+        filters = []
+        labels = {}
+        for input_index, key in enumerate(keys):
+            if len(uses[key]) == 1:
+                labels[uses[key][0]] = f"{input_index}:v"
+            else:
+                outs = "".join(f"[src{shot_index}]" for shot_index in uses[key])
+                filters.append(f"[{input_index}:v]split={len(uses[key])}{outs}")
+                for shot_index in uses[key]:
+                    labels[shot_index] = f"src{shot_index}"
+
+        if self.transition == "crossfade":
+            filters += self._crossfade_filters(shots, labels)
+        else:
+            filters += self._fade_filters(shots, labels)
+        return input_args, ";".join(filters)
+
+    def _hold(self, label: str, duration: float) -> str:
+        """Repeat a single decoded image for `duration` seconds"""
+        frames = max(1, round(duration * self.fps))
+        return (
+            f"[{label}]loop=loop={frames - 1}:size=1:start=0,"
+            f"setpts=N/({self.fps}*TB),fps={self.fps}:eof_action=pass,setsar=1,format=yuv420p"
+        )
+
+    def _fade_filters(self, shots: List[Shot], labels: dict) -> List[str]:
+        filters = []
+        for index, shot in enumerate(shots):
+            chain = self._hold(labels[index], shot.duration)
+            fade = min(shot.fade, shot.duration / 2)
+            if fade > 0:
+                chain += (
+                    f",fade=t=in:st=0:d={fade:.3f}"
+                    f",fade=t=out:st={shot.duration - fade:.3f}:d={fade:.3f}"
+                )
+            filters.append(f"{chain}[v{index}]")
+        streams = "".join(f"[v{index}]" for index in range(len(shots)))
+        filters.append(f"{streams}concat=n={len(shots)}:v=1:a=0[vout]")
+        return filters
+
+    def _crossfade_filters(self, shots: List[Shot], labels: dict) -> List[str]:
+        # Transition i blends shot i into shot i + 1. Each later shot is held
+        # for that much longer, so every shot still starts on schedule and
+        # the total length is unchanged.
+        # xfade needs at least a couple of frames to blend over
+        min_fade = 2.0 / self.fps
+        fades = [
+            max(min(shots[i].fade, shots[i + 1].fade, shots[i].duration / 2, shots[i + 1].duration / 2), min_fade)
+            for i in range(len(shots) - 1)
+        ]
+        filters = []
+        for index, shot in enumerate(shots):
+            lead_in = fades[index - 1] if index else 0.0
+            filters.append(f"{self._hold(labels[index], shot.duration + lead_in)}[v{index}]")
+
+        if len(shots) == 1:
+            filters.append("[v0]null[vout]")
+            return filters
+
+        previous = "v0"
+        start = shots[0].duration
+        for index in range(1, len(shots)):
+            fade = fades[index - 1]
+            out = "vout" if index == len(shots) - 1 else f"x{index}"
+            filters.append(
+                f"[{previous}][v{index}]xfade=transition=fade:"
+                f"duration={fade:.3f}:offset={start - fade:.3f}[{out}]"
+            )
+            previous = out
+            start += shots[index].duration
+        return filters
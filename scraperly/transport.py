@@ -0,0 +1,207 @@
+"""
+Connection-pooling HTTP transport shared by the HTTP-based AI providers
+"""
+
+import asyncio
+import threading
+import weakref
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def _http2_available():
+    try:
+        import httpx  # noqa: F401
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPTransport:
+    """
+    Keep-alive HTTP client with bounded per-host connection pools.
+
+    Sync requests go through a `requests.Session`, or an `httpx.Client` when
+    HTTP/2 is requested and the `httpx[http2]` extra is installed. Async
+    requests always use httpx, with one client per event loop.
+    """
+
+    def __init__(
+        self,
+        pool_connections=10,
+        pool_maxsize=10,
+        connect_timeout=10.0,
+        read_timeout=300.0,
+        http2=False
+    ):
+        """
+        Args:
+            pool_connections: Number of per-host pools to keep around
+            pool_maxsize: Maximum open connections kept alive per host
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait between bytes of the response
+            http2: Use HTTP/2 where the server and installed packages support it
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            print("HTTP/2 requested but httpx[http2] is not installed, using HTTP/1.1")
+
+        self._lock = threading.Lock()
+        self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def _httpx_limits(self, httpx):
+        return httpx.Limits(
+            max_connections=self.pool_connections * self.pool_maxsize,
+            max_keepalive_connections=self.pool_maxsize
+        )
+
+    def _httpx_timeout(self, httpx):
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+    def _sync_client(self):
+        with self._lock:
+            if self._client is None:
+                if self.http2:
+                    import httpx
+                    self._client = httpx.Client(
+                        http2=True,
+                        limits=self._httpx_limits(httpx),
+                        timeout=self._httpx_timeout(httpx)
+                    )
+                else:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._client = session
+            return self._client
+
+    def _async_client(self):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("httpx package not installed. Install with: pip install httpx")
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(
+                    http2=self.http2,
+                    limits=self._httpx_limits(httpx),
+                    timeout=self._httpx_timeout(httpx)
+                )
+                self._async_clients[loop] = client
+            return client
+
+    @property
+    def session(self):
+        """The underlying pooled sync client"""
+        return self._sync_client()
+
+    def post(self, url, **kwargs):
+        """Send a POST request over a pooled connection"""
+        client = self._sync_client()
+        if isinstance(client, requests.Session):
+            kwargs.setdefault("timeout", self.timeout)
+        return client.post(url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """Send a GET request over a pooled connection"""
+        client = self._sync_client()
+        if isinstance(client, requests.Session):
+            kwargs.setdefault("timeout", self.timeout)
+        return client.get(url, **kwargs)
+
+    @contextmanager
+    def stream_post(self, url, **kwargs):
+        """
+        Send a POST request and yield a response whose body is read lazily.
+        Use `iter_lines()` on the yielded response to consume it.
+        """
+        client = self._sync_client()
+        if isinstance(client, requests.Session):
+            kwargs.setdefault("timeout", self.timeout)
+            response = client.post(url, stream=True, **kwargs)
+            if response.encoding is None:
+                # Servers often omit the charset on event streams
+                response.encoding = "utf-8"
+            try:
+                # Small reads so each event is handed over as soon as it arrives
+                yield _StreamedResponse(response, response.iter_lines(chunk_size=1, decode_unicode=True))
+            finally:
+                response.close()
+        else:
+            with client.stream("POST", url, **kwargs) as response:
+                yield _StreamedResponse(response, response.iter_lines())
+
+    async def apost(self, url, **kwargs):
+        """Send a POST request from the running event loop"""
+        return await self._async_client().post(url, **kwargs)
+
+    def close(self):
+        """Close pooled sync connections"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self):
+        """Close the async client bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+
+class _StreamedResponse:
+    """Uniform view over streamed requests and httpx responses"""
+
+    def __init__(self, response, lines):
+        self._response = response
+        self._lines = lines
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    @property
+    def text(self):
+        if hasattr(self._response, "read"):
+            # httpx needs the body loaded before .text is available
+            self._response.read()
+        return self._response.text
+
+    def iter_lines(self):
+        for line in self._lines:
+            if line:
+                yield line
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(**options):
+    """Return a process-wide transport shared by all callers using the same options"""
+    key = tuple(sorted(options.items()))
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = HTTPTransport(**options)
+            _transports[key] = transport
+        return transport
@@ -0,0 +1,285 @@
+"""
+Text-to-speech backends used to narrate segments
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from .cache import ThreadLocalConnection, default_cache_dir, hash_key
+
+
+class TTSBackend(ABC):
+    """Base class for text-to-speech engines"""
+
+    name = None
+    extension = "wav"
+
+    @abstractmethod
+    def synthesize(self, text: str, output_path: str) -> str:
+        """Speak `text` into an audio file at `output_path` and return the path"""
+        pass
+
+    def voice_settings(self) -> dict:
+        """Settings that change how the audio sounds, used in cache keys"""
+        return {}
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate's online text-to-speech through gTTS"""
+
+    name = "gtts"
+    extension = "mp3"
+
+    def __init__(self, lang: str = "en", slow: bool = False, tld: str = "com"):
+        """
+        Args:
+            lang: Language of the text
+            slow: Read more slowly
+            tld: Google Translate domain to use, which changes the accent
+        """
+        try:
+            from gtts import gTTS
+            self._gTTS = gTTS
+        except ImportError:
+            raise ImportError("gTTS package not installed. Install with: pip install gTTS")
+        self.lang = lang
+        self.slow = slow
+        self.tld = tld
+
+    def voice_settings(self) -> dict:
+        return {"lang": self.lang, "slow": self.slow, "tld": self.tld}
+
+    def synthesize(self, text: str, output_path: str) -> str:
+        tts = self._gTTS(text=text, lang=self.lang, slow=self.slow, tld=self.tld)
+        tts.save(output_path)
+        return output_path
+
+
+class _CommandBackend(TTSBackend):
+    """Local engine run as a subprocess, with the text passed on stdin"""
+
+    def __init__(self, executable: str):
+        self.executable = shutil.which(executable) or executable
+
+    @abstractmethod
+    def _command(self, output_path: str):
+        """Command line that speaks stdin into `output_path`"""
+        pass
+
+    def synthesize(self, text: str, output_path: str) -> str:
+        try:
+            result = subprocess.run(
+                self._command(output_path),
+                input=text.encode("utf-8"),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+        except FileNotFoundError:
+            raise RuntimeError(f"{self.name} executable not found: {self.executable}")
+        if result.returncode != 0:
+            error = result.stderr.decode("utf-8", "replace").strip()
+            raise RuntimeError(f"{self.name} failed ({result.returncode}): {error[-500:]}")
+        return output_path
+
+
+class EspeakBackend(_CommandBackend):
+    """Offline synthesis with espeak-ng"""
+
+    name = "espeak"
+
+    def __init__(self, voice: str = "en", speed: int = 160, executable: str = "espeak-ng"):
+        """
+        Args:
+            voice: espeak-ng voice name, e.g. "en-us"
+            speed: Words per minute
+            executable: espeak-ng binary (or plain espeak)
+        """
+        super().__init__(executable)
+        self.voice = voice
+        self.speed = speed
+
+    def voice_settings(self) -> dict:
+        return {"voice": self.voice, "speed": self.speed}
+
+    def _command(self, output_path: str):
+        return [self.executable, "--stdin", "-v", self.voice, "-s", str(self.speed), "-w", output_path]
+
+
+class PiperBackend(_CommandBackend):
+    """Offline neural synthesis with Piper"""
+
+    name = "piper"
+
+    def __init__(self, model: str = None, speaker: int = None, length_scale: float = None, executable: str = "piper"):
+        """
+        Args:
+            model: Path to the Piper voice model (.onnx). Defaults to the
+                SCRAPERLY_PIPER_MODEL environment variable
+            speaker: Speaker id for multi-speaker models
+            length_scale: Speaking rate, values above 1 are slower
+            executable: Piper binary
+        """
+        model = model or os.environ.get("SCRAPERLY_PIPER_MODEL")
+        if not model:
+            raise ValueError(
+                "Piper needs a voice model. Pass model='path/to/voice.onnx' "
+                "or set SCRAPERLY_PIPER_MODEL"
+            )
+        super().__init__(executable)
+        self.model = model
+        self.speaker = speaker
+        self.length_scale = length_scale
+
+    def voice_settings(self) -> dict:
+        try:
+            # A retrained model at the same path must not reuse old audio
+            model_mtime = os.path.getmtime(self.model)
+        except OSError:
+            model_mtime = None
+        return {
+            "model": os.path.abspath(self.model),
+            "model_mtime": model_mtime,
+            "speaker": self.speaker,
+            "length_scale": self.length_scale,
+        }
+
+    def _command(self, output_path: str):
+        cmd = [self.executable, "--model", self.model, "--output_file", output_path]
+        if self.speaker is not None:
+            cmd += ["--speaker", str(self.speaker)]
+        if self.length_scale is not None:
+            cmd += ["--length_scale", str(self.length_scale)]
+        return cmd
+
+
+class AudioCache:
+    """
+    Content-addressed store of synthesized speech.
+
+    Audio is keyed by a hash of the text, backend and voice settings and
+    kept with its duration, so unchanged segments are reused without
+    synthesizing or decoding them again. Files are written to a temporary
+    name and renamed into place, and the index is a WAL-mode SQLite
+    database, so several processes can share one cache. Least recently
+    used entries are evicted once the cache exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=1024 ** 3):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "audio")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._connections = ThreadLocalConnection(os.path.join(self.cache_dir, "index.sqlite3"))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._connections.get().execute(
+            """
+            CREATE TABLE IF NOT EXISTS audio (
+                key TEXT PRIMARY KEY,
+                extension TEXT NOT NULL,
+                duration_ms INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+
+    @staticmethod
+    def key(backend: TTSBackend, text: str) -> str:
+        return hash_key(backend.name, backend.voice_settings(), text)
+
+    def path(self, key, extension):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{extension}")
+
+    def _count(self, attr):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def get(self, key):
+        """Return (audio path, duration in ms) for `key`, or None"""
+        conn = self._connections.get()
+        row = conn.execute(
+            "SELECT extension, duration_ms FROM audio WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or not os.path.exists(self.path(key, row[0])):
+            self._count("misses")
+            return None
+        conn.execute("UPDATE audio SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self._count("hits")
+        return self.path(key, row[0]), row[1]
+
+    def temp_path(self, extension):
+        """A fresh file name inside the cache to synthesize into before put()"""
+        fd, path = tempfile.mkstemp(dir=self.cache_dir, suffix=f".tmp.{extension}")
+        os.close(fd)
+        return path
+
+    def put(self, key, source_path, duration_ms):
+        """Move a synthesized file into the cache and return its final path"""
+        extension = source_path.rsplit(".", 1)[-1]
+        path = self.path(key, extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(source_path, path)
+        self._connections.get().execute(
+            """
+            INSERT OR REPLACE INTO audio (key, extension, duration_ms, size, accessed_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (key, extension, duration_ms, os.path.getsize(path), time.time())
+        )
+        self._evict()
+        return path
+
+    def _evict(self):
+        """Remove least recently used audio until the cache fits in max_bytes"""
+        if not self.max_bytes:
+            return
+        conn = self._connections.get()
+        total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM audio").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        for key, extension, size in conn.execute(
+            "SELECT key, extension, size FROM audio ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total_size <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM audio WHERE key = ?", (key,))
+            try:
+                os.remove(self.path(key, extension))
+            except OSError:
+                pass
+            total_size -= size
+
+    def stats(self):
+        entries, total_size = self._connections.get().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM audio"
+        ).fetchone()
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total_size}
+
+
+def get_tts_backend(backend_name: str = "gtts", **options) -> TTSBackend:
+    """
+    Factory function to get a TTS backend instance
+
+    Args:
+        backend_name: "gtts" (online), "espeak" or "piper" (offline)
+        **options: Passed to the backend's constructor, e.g. lang for gtts,
+            voice for espeak or model for piper (which otherwise comes from
+            SCRAPERLY_PIPER_MODEL)
+    """
+    backends = {
+        "gtts": GTTSBackend,
+        "espeak": EspeakBackend,
+        "piper": PiperBackend,
+    }
+    backend_class = backends.get(backend_name.lower())
+    if not backend_class:
+        raise ValueError(f"Unknown TTS backend: {backend_name}. Available backends: {', '.join(backends.keys())}")
+    return backend_class(**options)
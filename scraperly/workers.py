@@ -0,0 +1,97 @@
+"""
+Multi-process image decoding and letterboxing
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+from PIL import Image
+
+from .frames import letterbox
+
+
+def _letterbox_into(image_path, shm_name, width, height, background, resample):
+    """Worker: decode an image file and write the letterboxed frame into shared memory"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        frame = np.ndarray((height, width, 3), dtype=np.uint8, buffer=shm.buf)
+        with Image.open(image_path) as img:
+            letterbox(img, width, height, out=frame, background=background, resample=resample)
+        del frame
+    finally:
+        shm.close()
+
+
+class ImageProcessPool:
+    """
+    Spread image decode, resize and letterbox work across CPU cores.
+
+    Workers write finished frames into shared memory blocks allocated by
+    the parent, so only file paths and block names are pickled, never the
+    6 MB frames themselves.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def letterbox_files(self, jobs, store, width=1920, height=1080, background=(0, 0, 0), resample="lanczos"):
+        """
+        Letterbox image files in parallel.
+
+        `jobs` is an iterable of (key, image_path) pairs. Each finished frame
+        is passed to `store(key, frame)` while it still lives in shared
+        memory; `store` must copy or persist it and return what the caller
+        should keep. Yields (key, stored, error) as jobs complete.
+
+        At most two jobs per worker are in flight at once, so shared memory
+        use is bounded by the pool size rather than the number of images.
+        """
+        size = width * height * 3
+        max_in_flight = self.workers * 2
+        jobs = iter(jobs)
+        pending = {}
+        try:
+            while True:
+                for key, image_path in jobs:
+                    shm = shared_memory.SharedMemory(create=True, size=size)
+                    future = self._executor.submit(
+                        _letterbox_into, image_path, shm.name, width, height, background, resample
+                    )
+                    pending[future] = (key, shm)
+                    if len(pending) >= max_in_flight:
+                        break
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, shm = pending.pop(future)
+                    try:
+                        future.result()
+                        frame = np.ndarray((height, width, 3), dtype=np.uint8, buffer=shm.buf)
+                        result = (key, store(key, frame), None)
+                        del frame
+                    except Exception as e:
+                        result = (key, None, e)
+                    finally:
+                        shm.close()
+                        shm.unlink()
+                    yield result
+        finally:
+            # Release blocks of jobs the caller never consumed
+            for future, (key, shm) in pending.items():
+                future.cancel()
+                shm.close()
+                shm.unlink()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
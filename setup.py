@@ -35,6 +35,12 @@ setup(
             "openai>=1.0.0",
             "anthropic>=0.3.0",
         ],
+        'async': [
+            "httpx>=0.24.0",
+        ],
+        'http2': [
+            "httpx[http2]>=0.24.0",
+        ],
     },
     python_requires=">=3.9",
     author="adelelawady",
@@ -0,0 +1,164 @@
+"""
+LexicaHTTPClient against recorded Lexica responses
+"""
+
+import os
+
+import pytest
+import requests
+
+from scraperly.lexica import LexicaHTTPClient, LexicaScraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "lexica")
+
+
+def recorded_response(url, fixture=None, status_code=200, content_type="application/json"):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers["Content-Type"] = content_type
+    response.encoding = "utf-8"
+    if fixture:
+        with open(os.path.join(FIXTURES, fixture), "rb") as f:
+            response._content = f.read()
+    else:
+        response._content = b""
+    return response
+
+
+class RecordedTransport:
+    """Answers GET requests with recorded responses, keyed by URL"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append((url, kwargs.get("params")))
+        answer = self.responses.get(url)
+        if isinstance(answer, Exception):
+            raise answer
+        if answer is None:
+            return recorded_response(url, status_code=404, content_type="text/html")
+        return answer
+
+
+API_URL = "https://lexica.art/api/v1/search"
+PAGE_URL = "https://lexica.art/"
+
+
+def client_for(responses):
+    transport = RecordedTransport(responses)
+    return LexicaHTTPClient(transport=transport), transport
+
+
+def test_api_results_are_parsed():
+    client, transport = client_for({API_URL: recorded_response(API_URL, "search_api.json")})
+
+    images = client.search("lighthouse")
+
+    assert transport.requests == [(API_URL, {"q": "lighthouse"})]
+    assert images == [
+        {
+            "prompt": "a lighthouse on a cliff at sunset, cinematic lighting, highly detailed",
+            "model": "lexica-aperture-v3.5",
+            "image_url": "https://image.lexica.art/full_webp/0a1b2c3d-0000-4000-8000-000000000001",
+            "dimensions": "1024 x 1536",
+        },
+        {
+            "prompt": "stormy sea crashing against rocks, oil painting",
+            "model": "lexica-aperture-v3.5",
+            "image_url": "https://image.lexica.art/full_webp/0a1b2c3d-0000-4000-8000-000000000002",
+            "dimensions": "1536 x 1024",
+        },
+        {
+            "prompt": "lighthouse keeper reading by lamplight",
+            "model": "",
+            "image_url": "https://image.lexica.art/full_webp/0a1b2c3d-0000-4000-8000-000000000003",
+            "dimensions": "",
+        },
+    ]
+
+
+def test_api_results_respect_limit():
+    client, _ = client_for({API_URL: recorded_response(API_URL, "search_api.json")})
+
+    assert len(client.search("lighthouse", limit=2)) == 2
+
+
+@pytest.mark.parametrize("api_answer", [
+    requests.ConnectionError("connection refused"),
+    recorded_response(API_URL, status_code=404, content_type="text/html"),
+    recorded_response(API_URL, "search_page.html", content_type="text/html"),
+])
+def test_html_page_is_used_when_api_fails(api_answer):
+    client, transport = client_for({
+        API_URL: api_answer,
+        PAGE_URL: recorded_response(PAGE_URL, "search_page.html", content_type="text/html"),
+    })
+
+    images = client.search("lighthouse")
+
+    assert [url for url, _ in transport.requests] == [API_URL, PAGE_URL]
+    assert images == [
+        {
+            "prompt": "a lighthouse on a cliff at sunset, cinematic lighting, highly detailed",
+            "model": "",
+            "image_url": "https://image.lexica.art/full_webp/0a1b2c3d-0000-4000-8000-000000000001",
+            "dimensions": "1024 x 1536",
+        },
+        {
+            "prompt": "stormy sea crashing against rocks, oil painting",
+            "model": "",
+            "image_url": "https://image.lexica.art/full_webp/0a1b2c3d-0000-4000-8000-000000000002",
+            "dimensions": "",
+        },
+    ]
+
+
+def test_client_rendered_page_gives_no_results():
+    client, _ = client_for({
+        PAGE_URL: recorded_response(PAGE_URL, "search_page_empty.html", content_type="text/html"),
+    })
+
+    assert client.search("lighthouse") == []
+
+
+def test_auto_backend_falls_back_to_browser(monkeypatch):
+    client, _ = client_for({
+        PAGE_URL: recorded_response(PAGE_URL, "search_page_empty.html", content_type="text/html"),
+    })
+    scraper = LexicaScraper(image_limit=3, backend="auto", http_client=client)
+    browser_results = [{"prompt": "from browser", "model": "", "image_url": "u", "dimensions": ""}]
+    searched = []
+
+    def search_with_browser(search_query):
+        searched.append(search_query)
+        return browser_results
+
+    monkeypatch.setattr(scraper, "_search_with_browser", search_with_browser)
+
+    assert scraper.search_and_scrape("lighthouse") == browser_results
+    assert searched == ["lighthouse"]
+
+
+def test_auto_backend_skips_browser_when_http_answers(monkeypatch):
+    client, _ = client_for({API_URL: recorded_response(API_URL, "search_api.json")})
+    scraper = LexicaScraper(image_limit=2, backend="auto", http_client=client)
+    monkeypatch.setattr(scraper, "_search_with_browser", lambda query: pytest.fail("browser was started"))
+
+    images = scraper.search_and_scrape("lighthouse")
+
+    assert [image["prompt"] for image in images] == [
+        "a lighthouse on a cliff at sunset, cinematic lighting, highly detailed",
+        "stormy sea crashing against rocks, oil painting",
+    ]
+    assert scraper.driver is None
+
+
+def test_http_backend_never_falls_back(monkeypatch):
+    client, _ = client_for({})
+    scraper = LexicaScraper(backend="http", http_client=client)
+    monkeypatch.setattr(scraper, "_search_with_browser", lambda query: pytest.fail("browser was started"))
+
+    assert scraper.search_and_scrape("lighthouse") == []